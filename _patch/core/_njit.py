@@ -0,0 +1,26 @@
+"""
+Optional Numba JIT shim.
+
+``njit`` resolves to ``numba.njit(cache=True, fastmath=True)`` when numba is
+installed and to a no-op decorator otherwise, so kernels stay importable
+(running as plain Python) on deployments without numba.
+"""
+
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except Exception:
+    numba = None  # fallback if numba not installed
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args, **kwargs):
+    """Use as ``@njit``, ``@njit(parallel=True)`` or ``@njit("sig")``"""
+    fn = args[0] if len(args) == 1 and callable(args[0]) else None
+    if not NUMBA_AVAILABLE:
+        return fn if fn is not None else (lambda f: f)
+    opts = {"cache": True, "fastmath": True, **kwargs}
+    if fn is not None:
+        return numba.njit(**opts)(fn)
+    return numba.njit(*args, **opts)
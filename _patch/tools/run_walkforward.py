@@ -23,6 +23,7 @@ def main():
     ap.add_argument("--step", type=int, default=300)
     ap.add_argument("--horizon", type=int, default=96)
     ap.add_argument("--testnet", action="store_true")
+    ap.add_argument("--workers", type=int, default=0)
     args = ap.parse_args()
 
     g = load_json("config/global.json", {})
@@ -39,6 +40,7 @@ def main():
         source=args.source,
         csv_path=args.csv_path,
         testnet=args.testnet,
+        workers=args.workers,
     )
     print(json.dumps(m, indent=2))
 
@@ -0,0 +1,90 @@
+"""
+Fused indicator kernel for data_pipeline.add_indicators.
+
+One pass over high/low/close yields every EMA/Wilder series with the same
+warm-up conventions as the pandas helpers in data_pipeline: EMAs and RSI
+are NaN until their window is filled, ATR is 0 before its seed bar and is
+seeded with the mean of the first n true ranges.
+"""
+
+import numpy as np
+
+from core._njit import njit
+
+# fastmath is off: inputs may carry NaN (coerced klines) and the warm-up
+# outputs are NaN by design. nogil lets add_indicators_batch threads run
+# the kernel in parallel.
+@njit(fastmath=False, nogil=True)
+def compute_all(h, l, c, ema_fast_n, ema_slow_n, rsi_n, atr_n,
+                macd_f, macd_s, macd_sig):
+    """Return ema_fast, ema_slow, rsi, atr, macd, macd_signal, macd_hist;
+    a window <= 0 leaves its series all-NaN"""
+    n = c.shape[0]
+    ema_fast = np.full(n, np.nan)
+    ema_slow = np.full(n, np.nan)
+    rsi = np.full(n, np.nan)
+    atr = np.zeros(n)
+    macd = np.full(n, np.nan)
+    macd_signal = np.full(n, np.nan)
+    macd_hist = np.full(n, np.nan)
+    if n == 0:
+        return ema_fast, ema_slow, rsi, atr, macd, macd_signal, macd_hist
+
+    a_fast = 2.0 / (ema_fast_n + 1) if ema_fast_n > 0 else 0.0
+    a_slow = 2.0 / (ema_slow_n + 1) if ema_slow_n > 0 else 0.0
+    a_mf = 2.0 / (macd_f + 1) if macd_f > 0 else 0.0
+    a_ms = 2.0 / (macd_s + 1) if macd_s > 0 else 0.0
+    a_sig = 2.0 / (macd_sig + 1) if macd_sig > 0 else 0.0
+    macd0 = max(macd_f, macd_s) - 1
+    ef = es = mf = ms = c[0]
+    sig = 0.0
+    gain = loss = 0.0
+    tr_sum = 0.0
+    a = 0.0
+    for i in range(n):
+        ci = c[i]
+        if i > 0:
+            ef += a_fast * (ci - ef)
+            es += a_slow * (ci - es)
+            mf += a_mf * (ci - mf)
+            ms += a_ms * (ci - ms)
+        if ema_fast_n > 0 and i >= ema_fast_n - 1:
+            ema_fast[i] = ef
+        if ema_slow_n > 0 and i >= ema_slow_n - 1:
+            ema_slow[i] = es
+
+        if rsi_n > 0:
+            d = ci - c[i - 1] if i > 0 else 0.0
+            if i > 0:
+                gain += (max(d, 0.0) - gain) / rsi_n
+                loss += (max(-d, 0.0) - loss) / rsi_n
+            if i >= rsi_n - 1:
+                if loss == 0:
+                    rsi[i] = 100.0
+                else:
+                    rsi[i] = 100.0 - 100.0 / (1.0 + gain / loss)
+
+        if atr_n > 0:
+            tr = h[i] - l[i]
+            if i > 0:
+                tr = max(tr, abs(h[i] - c[i - 1]), abs(l[i] - c[i - 1]))
+            if i < atr_n:
+                tr_sum += tr
+                if i == atr_n - 1:
+                    a = tr_sum / atr_n
+                    atr[i] = a
+            else:
+                a += (tr - a) / atr_n
+                atr[i] = a
+
+        if macd_f > 0 and macd_s > 0 and macd_sig > 0 and i >= macd0:
+            m = mf - ms
+            macd[i] = m
+            if i == macd0:
+                sig = m
+            else:
+                sig += a_sig * (m - sig)
+            if i >= macd0 + macd_sig - 1:
+                macd_signal[i] = sig
+                macd_hist[i] = m - sig
+    return ema_fast, ema_slow, rsi, atr, macd, macd_signal, macd_hist
@@ -2,18 +2,27 @@
 import os
 import time
 import json
+import asyncio
 import pathlib
+import sqlite3
 import logging
+import threading
 from core.utils import load_json
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
 except Exception:
-    OpenAI = None  # fallback if sdk not installed
+    AsyncOpenAI = OpenAI = None  # fallback if sdk not installed
 
-CACHE_DIR = pathlib.Path(__file__).resolve().parents[1] / "data" / "llm_cache"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+try:
+    import orjson
+except Exception:
+    orjson = None  # fallback to stdlib json
+
+CACHE_DB = (
+    pathlib.Path(__file__).resolve().parents[1] / "data" / "llm_cache.sqlite"
+)
 
 
 def _logger():
@@ -38,46 +47,95 @@ def _load_cfg():
         return {}
 
 
-def _client():
+# One sync client per api key so HTTP connection pools are reused
+_CLIENTS: Dict[tuple, Any] = {}
+
+
+def _cached_client(kind: str, factory):
     api_key = os.getenv("OPENAI_API_KEY", "")
-    if not api_key or OpenAI is None:
-        return None
-    try:
-        return OpenAI(api_key=api_key)
-    except Exception as e:
-        log.warning(f"OpenAI init failed: {e}")
+    if not api_key or factory is None:
         return None
+    cli = _CLIENTS.get((kind, api_key))
+    if cli is None:
+        try:
+            cli = factory(api_key=api_key)
+        except Exception as e:
+            log.warning(f"OpenAI init failed: {e}")
+            return None
+        _CLIENTS[(kind, api_key)] = cli
+    return cli
+
+
+def _client():
+    return _cached_client("sync", OpenAI)
+
+
+# Hot cache entries live in _MEM; sqlite is the persistent backing store.
+# The connection is per process (reopened after fork) and lock-guarded.
+_MEM: Dict[str, tuple] = {}
+_DB = None
+_DB_PID = None
+_DB_LOCK = threading.Lock()
+
+
+def _db() -> sqlite3.Connection:
+    global _DB, _DB_PID
+    if _DB is None or _DB_PID != os.getpid():
+        CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(CACHE_DB), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache "
+            "(k TEXT PRIMARY KEY, ts REAL NOT NULL, data TEXT NOT NULL)"
+        )
+        _DB, _DB_PID = conn, os.getpid()
+    return _DB
 
 
 def _cache_get(kind: str, key: str, max_age_sec: int):
-    p = CACHE_DIR / f"{kind}_{key}.json"
-    if not p.exists():
-        return None
+    k = f"{kind}_{key}"
+    now = time.time()
+    hit = _MEM.get(k)
+    if hit is not None and now - hit[0] <= max_age_sec:
+        return hit[1]
+    # Missing or expired in memory: another process may have stored a
+    # fresher value in sqlite
     try:
-        obj = json.loads(p.read_text(encoding="utf-8"))
-        if time.time() - obj.get("_ts", 0) <= max_age_sec:
-            return obj.get("data")
+        with _DB_LOCK:
+            row = _db().execute(
+                "SELECT ts, data FROM llm_cache WHERE k = ?", (k,)
+            ).fetchone()
+        if row is None:
+            return None
+        hit = (float(row[0]), json.loads(row[1]))
     except Exception:
         return None
+    _MEM[k] = hit
+    if now - hit[0] <= max_age_sec:
+        return hit[1]
     return None
 
 
 def _cache_set(kind: str, key: str, data: Any):
-    p = CACHE_DIR / f"{kind}_{key}.json"
-    p.write_text(
-        json.dumps({"_ts": time.time(), "data": data}), encoding="utf-8"
-    )
-
+    k = f"{kind}_{key}"
+    ts = time.time()
+    _MEM[k] = (ts, data)
+    try:
+        with _DB_LOCK:
+            conn = _db()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (k, ts, data) "
+                "VALUES (?, ?, ?)",
+                (k, ts, json.dumps(data)),
+            )
+            conn.commit()
+    except Exception as e:
+        log.warning(f"LLM cache write failed: {e}")
 
-def _call_llm_json(
-    prompt: str, max_tokens: int = None, timeout_s: float = None
-) -> Dict[str, Any]:
-    """Call OpenAI API with robust error handling and fallbacks"""
-    cli = _client()
-    if cli is None:
-        return {"error": "OpenAI client not available", "bias": 0.5}
 
-    # Load configurable constants
+def _llm_settings(max_tokens: int = None, timeout_s: float = None):
+    """Resolve (max_tokens, timeout_s, model) from config/constants.json"""
     try:
         constants = load_json("config/constants.json", {})
         openai_config = constants.get("openai", {})
@@ -93,35 +151,49 @@ def _call_llm_json(
 
     model = (os.getenv("OPENAI_MODEL_MINI") or 
              os.getenv("OPENAI_MODEL") or default_model)
+    return max_tokens, timeout_s, model
+
+
+def _llm_messages(prompt: str):
+    return [
+        {
+            "role": "system",
+            "content": "Return ONLY valid JSON. Keys must be simple.",
+        },
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _parse_llm_content(content: str) -> Dict[str, Any]:
+    # response_format=json_object guarantees a bare JSON object
+    try:
+        if orjson is not None:
+            return orjson.loads(content or "{}")
+        return json.loads(content or "{}")
+    except Exception:
+        # Final fallback: return safe default
+        return {"error": "Invalid JSON response", "bias": 0.5}
+
+
+def _call_llm_json(
+    prompt: str, max_tokens: int = None, timeout_s: float = None
+) -> Dict[str, Any]:
+    """Call OpenAI API with robust error handling and fallbacks"""
+    cli = _client()
+    if cli is None:
+        return {"error": "OpenAI client not available", "bias": 0.5}
+
+    max_tokens, timeout_s, model = _llm_settings(max_tokens, timeout_s)
     try:
         resp = cli.chat.completions.create(
             model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Return ONLY valid JSON. Keys must be simple.",
-                },
-                {"role": "user", "content": prompt},
-            ],
+            messages=_llm_messages(prompt),
             temperature=0.1,
             max_tokens=max_tokens,
             timeout=timeout_s,
+            response_format={"type": "json_object"},
         )
-        content = resp.choices[0].message.content or "{}"
-        try:
-            return json.loads(content)
-        except Exception:
-            content = content.strip()
-            if content.startswith("```"):
-                if "\n" in content:
-                    content = content.strip("`").split("\n", 1)[1]
-                else:
-                    content = "{}"
-            try:
-                return json.loads(content)
-            except Exception:
-                # Final fallback: return safe default
-                return {"error": "Invalid JSON response", "bias": 0.5}
+        return _parse_llm_content(resp.choices[0].message.content)
     except Exception as e:
         log = _logger()
         log.warning(f"LLM call failed: {e}")
@@ -129,20 +201,82 @@ def _call_llm_json(
         return {"error": str(e), "bias": 0.5}
 
 
+async def _call_llm_json_async(
+    cli, prompt: str, max_tokens: int = None, timeout_s: float = None
+) -> Dict[str, Any]:
+    """Async twin of _call_llm_json, used to overlap batched requests"""
+    max_tokens, timeout_s, model = _llm_settings(max_tokens, timeout_s)
+    try:
+        resp = await cli.chat.completions.create(
+            model=model,
+            messages=_llm_messages(prompt),
+            temperature=0.1,
+            max_tokens=max_tokens,
+            timeout=timeout_s,
+            response_format={"type": "json_object"},
+        )
+        return _parse_llm_content(resp.choices[0].message.content)
+    except Exception as e:
+        log.warning(f"LLM call failed: {e}")
+        return {"error": str(e), "bias": 0.5}
+
+
+def _call_llm_json_many(
+    prompts: List[str], max_tokens: int = None, timeout_s: float = None
+) -> List[Dict[str, Any]]:
+    """Run several prompts concurrently; falls back to sequential calls
+    when already inside an event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        return [_call_llm_json(p, max_tokens, timeout_s) for p in prompts]
+
+    api_key = os.getenv("OPENAI_API_KEY", "")
+    if not api_key or AsyncOpenAI is None:
+        return [
+            {"error": "OpenAI client not available", "bias": 0.5}
+            for _ in prompts
+        ]
+
+    # The async client's connection pool is bound to the loop that opened
+    # it and asyncio.run makes a fresh loop per call, so the client lives
+    # (and is closed) inside that loop rather than being cached
+    async def _gather():
+        try:
+            cli = AsyncOpenAI(api_key=api_key)
+        except Exception as e:
+            log.warning(f"OpenAI init failed: {e}")
+            return [
+                {"error": "OpenAI client not available", "bias": 0.5}
+                for _ in prompts
+            ]
+        async with cli:
+            return await asyncio.gather(
+                *(
+                    _call_llm_json_async(cli, p, max_tokens, timeout_s)
+                    for p in prompts
+                )
+            )
+
+    return list(asyncio.run(_gather()))
+
+
 def _clamp(v: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, v))
 
 
-def llm_pair_score(symbol: str, snapshot: Dict[str, Any]) -> float:
-    key = f"pair_{symbol}"
-    cached = _cache_get("pair", key, max_age_sec=30 * 60)
-    if cached is not None:
-        return float(cached)
+def _llm_timeout_s() -> float:
+    return float(_load_cfg().get("timeout_ms", 600)) / 1000.0 or 0.6
+
+
+def _pair_prompt(symbol: str, snapshot: Dict[str, Any]) -> str:
     snap = {
         k: float(snapshot.get(k, 0) or 0)
         for k in ("ret24h", "atr", "eff", "spread_bps", "funding")
     }
-    prompt = (
+    return (
         'You are a quant co-pilot. Given numeric snapshot, '
         'output JSON {"score": -1..1}.\n'
         f"symbol={symbol}\n"
@@ -151,17 +285,55 @@ def llm_pair_score(symbol: str, snapshot: Dict[str, Any]) -> float:
         "reasonable spread; lower score for choppy/whipsaw/noisy conditions. "
         "No text, JSON only."
     )
+
+
+def _pair_score_from(obj: Any) -> float:
+    score = float(obj.get("score", 0.0) if isinstance(obj, dict) else 0.0)
+    return _clamp(score, -1.0, 1.0)
+
+
+def llm_pair_score(symbol: str, snapshot: Dict[str, Any]) -> float:
+    key = f"pair_{symbol}"
+    cached = _cache_get("pair", key, max_age_sec=30 * 60)
+    if cached is not None:
+        return float(cached)
     obj = _call_llm_json(
-        prompt,
+        _pair_prompt(symbol, snapshot),
         max_tokens=60,
-        timeout_s=float(_load_cfg().get("timeout_ms", 600)) / 1000.0 or 0.6,
+        timeout_s=_llm_timeout_s(),
     )
-    score = float(obj.get("score", 0.0) if isinstance(obj, dict) else 0.0)
-    score = _clamp(score, -1.0, 1.0)
+    score = _pair_score_from(obj)
     _cache_set("pair", key, score)
     return score
 
 
+def batch_pair_scores(
+    symbols: List[str], snapshots: Dict[str, Dict[str, Any]]
+) -> Dict[str, float]:
+    """llm_pair_score for many symbols: cache hits first, then one
+    concurrent round of LLM requests for the rest"""
+    out: Dict[str, float] = {}
+    todo = []
+    for sym in symbols:
+        cached = _cache_get("pair", f"pair_{sym}", max_age_sec=30 * 60)
+        if cached is not None:
+            out[sym] = float(cached)
+        else:
+            todo.append(sym)
+    if not todo:
+        return out
+    objs = _call_llm_json_many(
+        [_pair_prompt(sym, snapshots.get(sym, {})) for sym in todo],
+        max_tokens=60,
+        timeout_s=_llm_timeout_s(),
+    )
+    for sym, obj in zip(todo, objs):
+        score = _pair_score_from(obj)
+        _cache_set("pair", f"pair_{sym}", score)
+        out[sym] = score
+    return out
+
+
 def llm_context_score(symbol: str, snapshot: Dict[str, Any]) -> float:
     key = f"context_{symbol}"
     cached = _cache_get("context", key, max_age_sec=30 * 60)
@@ -181,7 +353,7 @@ def llm_context_score(symbol: str, snapshot: Dict[str, Any]) -> float:
     obj = _call_llm_json(
         prompt,
         max_tokens=60,
-        timeout_s=float(_load_cfg().get("timeout_ms", 600)) / 1000.0 or 0.6,
+        timeout_s=_llm_timeout_s(),
     )
     ctx = float(obj.get("ctx", 0.0) if isinstance(obj, dict) else 0.0)
     ctx = _clamp(ctx, -1.0, 1.0)
@@ -199,7 +371,7 @@ def llm_confirm(payload: Dict[str, Any]) -> Dict[str, Any]:
     obj = _call_llm_json(
         prompt,
         max_tokens=80,
-        timeout_s=float(_load_cfg().get("timeout_ms", 600)) / 1000.0 or 0.6,
+        timeout_s=_llm_timeout_s(),
     )
     if not obj:
         return {"ok": True, "why": "fallback"}
@@ -1,5 +1,7 @@
 import time
 import json
+import atexit
+import threading
 from pathlib import Path
 
 # Safe imports with fallbacks - PERBAIKAN CIRCULAR IMPORT
@@ -32,17 +34,49 @@ except ImportError:
 
 
 ALERT_STATE_PATH = Path("reports/alert_state.json")
+FLUSH_DELAY_SEC = 5.0
+
+# Cooldown state is loaded once and kept in memory; writes are debounced
+# into a single save at most every FLUSH_DELAY_SEC (and at exit).
+_STATE = None
+_DIRTY = False
+_FLUSH_TIMER = None
+_LOCK = threading.RLock()
 
 
 def _state():
-    s = load_json(ALERT_STATE_PATH, {})
-    if "last" not in s:
-        s["last"] = {}
-    return s
+    global _STATE
+    with _LOCK:
+        if _STATE is None:
+            s = load_json(ALERT_STATE_PATH, {}) or {}
+            if "last" not in s:
+                s["last"] = {}
+            _STATE = s
+        return _STATE
+
+
+def _flush():
+    global _DIRTY, _FLUSH_TIMER
+    with _LOCK:
+        _FLUSH_TIMER = None
+        if not _DIRTY:
+            return
+        snapshot = {**_STATE, "last": dict(_STATE["last"])}
+        _DIRTY = False
+    save_json(ALERT_STATE_PATH, snapshot)
 
 
-def _save(s):
-    save_json(ALERT_STATE_PATH, s)
+def _mark_dirty():
+    global _DIRTY, _FLUSH_TIMER
+    with _LOCK:
+        _DIRTY = True
+        if _FLUSH_TIMER is None:
+            _FLUSH_TIMER = threading.Timer(FLUSH_DELAY_SEC, _flush)
+            _FLUSH_TIMER.daemon = True
+            _FLUSH_TIMER.start()
+
+
+atexit.register(_flush)
 
 
 def get_alerts_cfg():
@@ -58,13 +92,14 @@ def get_alerts_cfg():
 
 
 def _cooldown_ok(key, cd):
-    s = _state()
-    last = s["last"].get(key, 0)
     now = time.time()
-    if now - last >= cd:
-        s["last"][key] = now
-        _save(s)
-        return True
+    with _LOCK:
+        s = _state()
+        last = s["last"].get(key, 0)
+        if now - last >= cd:
+            s["last"][key] = now
+            _mark_dirty()
+            return True
     return False
 
 
@@ -1,12 +1,23 @@
+import csv
 import json
+import os
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
 from pathlib import Path
 from typing import Any, Dict
 
 import numpy as np
 import pandas as pd
 
+try:
+    import numexpr as ne
+except Exception:
+    ne = None  # fallback if numexpr not installed
+
+from core._njit import NUMBA_AVAILABLE, njit
 from core.ai_signal import combine_signals
 from core.logger import get_logger
 from core.utils import load_json
@@ -19,59 +30,185 @@ if str(ROOT) not in sys.path:
 log = get_logger("walkforward")
 
 
+def _rolling_mean(x: np.ndarray, w: int) -> np.ndarray:
+    """Trailing w-bar mean; the first w-1 bars are NaN like pandas"""
+    out = np.full(x.shape[0], np.nan)
+    if x.shape[0] >= w:
+        c = np.concatenate(([0.0], np.cumsum(x)))
+        out[w - 1:] = (c[w:] - c[:-w]) / w
+    return out
+
+
+def _sma_bfill(close: np.ndarray, w: int) -> np.ndarray:
+    out = _rolling_mean(close, w)
+    if close.shape[0] >= w:
+        out[:w - 1] = out[w - 1]
+    return out
+
+
+def _abs_returns(close: np.ndarray) -> np.ndarray:
+    """|pct change| of close, one element shorter than close"""
+    c1, c0 = close[1:], close[:-1]
+    if ne is not None:
+        return ne.evaluate("abs((c1 - c0) / c0)")
+    return np.abs((c1 - c0) / c0)
+
+
+def _diff_mean(close: np.ndarray, w: int) -> np.ndarray:
+    """w-bar mean of close.diff(), which telescopes to (c[t] - c[t-w]) / w"""
+    c1, c0 = close[w:], close[:-w]
+    if ne is not None:
+        return ne.evaluate("(c1 - c0) / w")
+    return (c1 - c0) / w
+
+
+@njit
+def _vol_feature(close, w=20, default=0.002):
+    """Rolling mean of |pct change| in one sweep (ring buffer + running sum)"""
+    n = close.shape[0]
+    out = np.full(n, default)
+    buf = np.zeros(w)
+    s = 0.0
+    for t in range(1, n):
+        r = abs((close[t] - close[t - 1]) / close[t - 1])
+        k = t % w
+        s += r - buf[k]
+        buf[k] = r
+        if t >= w:
+            out[t] = s / w
+    return out
+
+
 def _ensure_features(df: pd.DataFrame) -> pd.DataFrame:
+    close = df["close"].to_numpy(dtype=np.float64)
+    n = close.shape[0]
     if "ema_fast" not in df.columns:
-        df["ema_fast"] = df["close"].rolling(10).mean().bfill()
+        df["ema_fast"] = _sma_bfill(close, 10)
     if "ema_slow" not in df.columns:
-        df["ema_slow"] = df["close"].rolling(30).mean().bfill()
+        df["ema_slow"] = _sma_bfill(close, 30)
     if "macd_hist" not in df.columns:
-        df["macd_hist"] = df["close"].diff().rolling(12).mean().fillna(0)
+        macd = np.zeros(n)
+        if n > 12:
+            macd[12:] = _diff_mean(close, 12)
+        df["macd_hist"] = macd
     if "vol" not in df.columns:
-        df["vol"] = (df["close"].pct_change().abs()
-                     .rolling(20).mean().fillna(0.002))
+        if NUMBA_AVAILABLE:
+            vol = _vol_feature(close, 20, 0.002)
+        else:
+            vol = np.full(n, 0.002)
+            if n > 20:
+                vol[20:] = _rolling_mean(_abs_returns(close), 20)[19:]
+        df["vol"] = vol
     return df
 
 
+@njit
+def _hit_buy(high, low, tp_price, sl_price):
+    for i in range(high.shape[0]):
+        if high[i] >= tp_price:
+            return 1, i + 1
+        if low[i] <= sl_price:
+            return -1, i + 1
+    return 0, high.shape[0]
+
+
+@njit
+def _hit_sell(high, low, tp_price, sl_price):
+    for i in range(high.shape[0]):
+        if low[i] <= tp_price:
+            return 1, i + 1
+        if high[i] >= sl_price:
+            return -1, i + 1
+    return 0, high.shape[0]
+
+
+_HIT_LABELS = {1: "TP", -1: "SL", 0: "NONE"}
+# Below this many bars NumPy call overhead outweighs the vectorised scan
+_VECTOR_MIN_BARS = 32
+
+
+def _first_hit(tp_hit: np.ndarray, sl_hit: np.ndarray):
+    """First bar where TP or SL is touched; ties resolve to TP"""
+    any_hit = tp_hit | sl_hit
+    if not any_hit.any():
+        return 0, any_hit.shape[0]
+    idx = int(any_hit.argmax())
+    return (1 if tp_hit[idx] else -1), idx + 1
+
+
+def _vec_buy(high, low, tp_price, sl_price):
+    return _first_hit(high >= tp_price, low <= sl_price)
+
+
+def _vec_sell(high, low, tp_price, sl_price):
+    return _first_hit(low <= tp_price, high >= sl_price)
+
+
+# side -> (jitted scan, vectorised scan, tp direction, sl direction)
+_SCANNERS = {
+    "BUY": (_hit_buy, _vec_buy, 1.0, -1.0),
+    "SELL": (_hit_sell, _vec_sell, -1.0, 1.0),
+}
+
+
 def _hit_tpsl_path(
     high: np.ndarray, low: np.ndarray, entry: float, tp: float, sl: float,
     side: str
 ):
-    tp_price = entry * (1 + tp) if side == "BUY" else entry * (1 - tp)
-    sl_price = entry * (1 - sl) if side == "BUY" else entry * (1 + sl)
-    for i in range(len(high)):
-        if side == "BUY":
-            if high[i] >= tp_price:
-                return "TP", i + 1
-            if low[i] <= sl_price:
-                return "SL", i + 1
-        else:
-            if low[i] <= tp_price:
-                return "TP", i + 1
-            if high[i] >= sl_price:
-                return "SL", i + 1
-    return "NONE", len(high)
+    # Anything other than BUY is treated as a short, as before
+    scan, vec, tp_dir, sl_dir = _SCANNERS.get(side, _SCANNERS["SELL"])
+    # Compare in the arrays' own precision (float32 in walkforward)
+    tp_price = high.dtype.type(entry * (1 + tp_dir * tp))
+    sl_price = high.dtype.type(entry * (1 + sl_dir * sl))
+    if NUMBA_AVAILABLE or len(high) < _VECTOR_MIN_BARS:
+        code, bars = scan(high, low, tp_price, sl_price)
+    else:
+        code, bars = vec(high, low, tp_price, sl_price)
+    return _HIT_LABELS[code], bars
 
 
 def _simulate_trade_path(
-    df_future: pd.DataFrame, entry: float, side: str, tp: float, sl: float
+    high: np.ndarray, low: np.ndarray, close_last: float, entry: float,
+    side: str, tp: float, sl: float
 ) -> Dict[str, Any]:
-    res, bars = _hit_tpsl_path(
-        df_future["high"].values, df_future["low"].values, entry, tp, sl,
-        side
-    )
+    res, bars = _hit_tpsl_path(high, low, entry, tp, sl, side)
     if res == "TP":
         pnl = tp
     elif res == "SL":
         pnl = -sl
     else:
-        last = float(df_future["close"].iloc[-1])
         if side == "BUY":
-            pnl = (last - entry) / entry
+            pnl = (close_last - entry) / entry
         else:
-            pnl = (entry - last) / entry
+            pnl = (entry - close_last) / entry
     return {"result": res, "bars": int(bars), "pnl_frac": float(pnl)}
 
 
+# Seeded generator for the synthetic fallback: reproducible runs and the
+# faster PCG64 stream instead of the legacy global MT19937
+_RNG = np.random.default_rng(0)
+_SYNTH_CACHE: Dict[tuple, pd.DataFrame] = {}
+
+
+def _synthetic_data(symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+    key = (symbol, timeframe, limit)
+    if key not in _SYNTH_CACHE:
+        idx = pd.date_range(
+            end=pd.Timestamp.utcnow(), periods=limit, freq="5min"
+        )
+        close = 30000 + np.cumsum(
+            _RNG.standard_normal(limit, dtype=np.float32) * 20,
+            dtype=np.float32,
+        )
+        high = close + _RNG.random(limit, dtype=np.float32) * 10
+        low = close - _RNG.random(limit, dtype=np.float32) * 10
+        _SYNTH_CACHE[key] = pd.DataFrame({
+            "start": idx, "open": close, "high": high, "low": low,
+            "close": close
+        })
+    return _SYNTH_CACHE[key]
+
+
 def _fetch_data(
     symbol: str, timeframe: str, limit: int, source: str, csv_path: str,
     testnet: bool
@@ -94,16 +231,183 @@ def _fetch_data(
             )
         except Exception as e:
             log.warning(f"fetch_klines failed: {e}; fallback synthetic")
-            idx = pd.date_range(
-                end=pd.Timestamp.utcnow(), periods=limit, freq="5min"
-            )
-            close = 30000 + np.cumsum(np.random.normal(0, 20, limit))
-            high = close + np.random.rand(limit) * 10
-            low = close - np.random.rand(limit) * 10
-            return pd.DataFrame({
-                "start": idx, "open": close, "high": high, "low": low,
-                "close": close
-            })
+            return _synthetic_data(symbol, timeframe, limit).copy()
+
+
+@njit
+def _simulate_batch(high, low, close, js, dirs, tps, sls, horizon, cost):
+    """Fused TP/SL scan + PnL for every entry of a window in one native
+    call. dirs is +1 for BUY, -1 for SELL; pnl is net of cost."""
+    m = js.shape[0]
+    codes = np.zeros(m, dtype=np.int64)
+    bars = np.zeros(m, dtype=np.int64)
+    pnl = np.empty(m, dtype=np.float64)
+    for k in range(m):
+        j = js[k]
+        end = j + 1 + horizon
+        entry = close[j]
+        tp_price = np.float32(entry * (1.0 + dirs[k] * tps[k]))
+        sl_price = np.float32(entry * (1.0 - dirs[k] * sls[k]))
+        hi, lo = high[j + 1:end], low[j + 1:end]
+        if dirs[k] > 0:
+            code, nb = _hit_buy(hi, lo, tp_price, sl_price)
+        else:
+            code, nb = _hit_sell(hi, lo, tp_price, sl_price)
+        if code == 1:
+            p = tps[k]
+        elif code == -1:
+            p = -sls[k]
+        else:
+            p = dirs[k] * (close[end - 1] - entry) / entry
+        codes[k] = code
+        bars[k] = nb
+        pnl[k] = p - cost
+    return codes, bars, pnl
+
+
+# _RESULT_LABELS[code + 1] maps scanner codes (-1, 0, 1) to labels
+_RESULT_LABELS = np.array(["SL", "NONE", "TP"])
+
+
+def _simulate_trades(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, js: np.ndarray,
+    out: Dict[str, np.ndarray], horizon: int, cost: float
+):
+    """Fill out's result/pnl/bars columns for entries at bars js"""
+    if NUMBA_AVAILABLE:
+        dirs = np.where(out["side"] == "BUY", 1.0, -1.0)
+        codes, bars, pnl = _simulate_batch(
+            high, low, close, js, dirs, out["tp"], out["sl"], horizon, cost
+        )
+        out["result"][:] = _RESULT_LABELS[codes + 1]
+        out["bars"][:] = bars
+        out["pnl"][:] = pnl
+        return
+    for k, j in enumerate(js):
+        end = j + 1 + horizon
+        sim = _simulate_trade_path(
+            high[j + 1:end], low[j + 1:end], float(close[end - 1]),
+            float(close[j]), out["side"][k], float(out["tp"][k]),
+            float(out["sl"][k])
+        )
+        out["result"][k] = sim["result"]
+        out["bars"][k] = sim["bars"]
+        out["pnl"][k] = sim["pnl_frac"] - cost
+
+
+# Per-trade columns, stored struct-of-arrays
+_TRADE_DTYPES = {
+    "ts": np.int64,  # epoch ns, stringified only for the report
+    "side": "U4",
+    "entry": np.float64,
+    "tp": np.float64,
+    "sl": np.float64,
+    "result": "U4",
+    "pnl": np.float64,
+    "bars": np.int64,
+}
+
+
+def _empty_trades(cap: int) -> Dict[str, np.ndarray]:
+    return {k: np.empty(cap, dtype=dt) for k, dt in _TRADE_DTYPES.items()}
+
+
+_CSV_COLUMNS = (
+    "ts", "mode", "symbol", "side", "entry", "tp", "sl", "result", "pnl",
+    "bars",
+)
+
+
+def _write_trades(
+    writer, cols: Dict[str, np.ndarray], mode: str, symbol: str
+):
+    n = len(cols["pnl"])
+    if not n:
+        return
+    ts_str = pd.to_datetime(cols["ts"], unit="ns", utc=True).astype(str)
+    writer.writerows(zip(
+        ts_str, repeat(mode, n), repeat(symbol, n), cols["side"].tolist(),
+        cols["entry"].tolist(), cols["tp"].tolist(), cols["sl"].tolist(),
+        cols["result"].tolist(), cols["pnl"].tolist(), cols["bars"].tolist(),
+    ))
+
+
+def _candidate_bars(
+    test_slice: pd.DataFrame, start: int, stop: int, mode: str,
+    mcfg: Dict[str, Any]
+) -> np.ndarray:
+    """Bar indices worth asking combine_signals about. Every bar, unless
+    the mode config opts in with "prefilter_bars": true; then bars outside
+    its vol band (vol_gates / vol_low..vol_high) or with an EMA gap below
+    min_ema_gap are skipped. combine_signals does not apply these gates
+    itself, so the opt-in changes results."""
+    idx = np.arange(start, max(start, stop))
+    if not mcfg.get("prefilter_bars", False):
+        return idx
+    gate = (mcfg.get("vol_gates") or {}).get(mode)
+    lo, hi = gate if gate else (mcfg.get("vol_low"), mcfg.get("vol_high"))
+    keep = np.ones(idx.shape[0], dtype=bool)
+    if lo is not None or hi is not None:
+        vol = test_slice["vol"].to_numpy(dtype=np.float64)[idx]
+        if lo is not None:
+            keep &= vol >= float(lo)
+        if hi is not None:
+            keep &= vol <= float(hi)
+    gap = float(mcfg.get("min_ema_gap", 0.0) or 0.0)
+    if gap > 0:
+        ema_fast = test_slice["ema_fast"].to_numpy(dtype=np.float64)[idx]
+        ema_slow = test_slice["ema_slow"].to_numpy(dtype=np.float64)[idx]
+        keep &= np.abs(ema_fast - ema_slow) > gap
+    return idx[keep]
+
+
+def _run_window(
+    test_slice: pd.DataFrame,
+    mode: str,
+    symbol: str,
+    mcfg: Dict[str, Any],
+    horizon_bars: int,
+    ctx_bars: int,
+    testnet: bool,
+    cost: float,
+) -> Dict[str, np.ndarray]:
+    """Simulate one test window; returns its trade columns (pnl is net of
+    the round-trip cost)"""
+    js = _candidate_bars(
+        test_slice, 50, len(test_slice) - horizon_bars - 1, mode, mcfg
+    )
+    cols = _empty_trades(len(js))
+    hit_j = np.empty(len(js), dtype=np.int64)
+    n = 0
+    # The TP/SL scan only compares prices, so float32 is ample and halves
+    # the bytes streamed; close stays float64 for entry/PnL maths.
+    high_np = np.ascontiguousarray(
+        test_slice["high"].to_numpy(dtype=np.float32)
+    )
+    low_np = np.ascontiguousarray(
+        test_slice["low"].to_numpy(dtype=np.float32)
+    )
+    close_np = test_slice["close"].to_numpy(dtype=np.float64)
+    start_ns = (
+        test_slice["start"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    )
+    for j in js:
+        ctx = test_slice.iloc[max(0, j + 1 - ctx_bars):j + 1]
+        sig = combine_signals(mode, ctx, mcfg, symbol=symbol, testnet=testnet)
+        if sig.get("action", "SKIP") == "SKIP":
+            continue
+        hit_j[n] = j
+        cols["ts"][n] = start_ns[j]
+        cols["side"][n] = sig["action"]
+        cols["entry"][n] = close_np[j]
+        cols["tp"][n] = float(sig["tp"])
+        cols["sl"][n] = float(sig["sl"])
+        n += 1
+    out = {k: v[:n] for k, v in cols.items()}
+    _simulate_trades(
+        high_np, low_np, close_np, hit_j[:n], out, horizon_bars, cost
+    )
+    return out
 
 
 def walkforward(
@@ -119,81 +423,70 @@ def walkforward(
     testnet: bool = True,
     fee_rt: float = 0.0006,
     slip_rt: float = 0.0003,
+    workers: int = 0,
 ) -> Dict[str, Any]:
     # g = load_json("config/global.json", {})  # Unused variable
     mcfg = load_json(f"config/{mode}.json", {})
     total = train_bars + test_bars * 4 + 100
     df = _fetch_data(symbol, timeframe, total, source, csv_path, testnet)
-    df["start"] = pd.to_datetime(df["start"], utc=True, errors="coerce")
+    if not isinstance(df["start"].dtype, pd.DatetimeTZDtype):
+        df["start"] = pd.to_datetime(df["start"], utc=True, errors="coerce")
     df = df.dropna().reset_index(drop=True)
     df = _ensure_features(df)
 
-    trades = []
-    eq = 1.0
-    i = train_bars
-    while i + test_bars < len(df):
-        test_slice = df.iloc[i:i + test_bars].reset_index(drop=True)
-        for j in range(50, len(test_slice) - horizon_bars - 1):
-            ctx = test_slice.iloc[:j + 1].copy()
-            sig = combine_signals(
-                mode, ctx, mcfg, symbol=symbol, testnet=testnet
-            )
-            if sig.get("action", "SKIP") == "SKIP":
-                continue
-            entry = float(ctx["close"].iloc[-1])
-            side = sig["action"]
-            tp = float(sig["tp"])
-            sl = float(sig["sl"])
-            future = test_slice.iloc[j + 1:j + 1 + horizon_bars][
-                ["open", "high", "low", "close"]
-            ]
-            sim = _simulate_trade_path(future, entry, side, tp, sl)
-            cost = fee_rt + 2 * slip_rt
-            pnl_net = sim["pnl_frac"] - cost
-            eq *= 1 + pnl_net
-            trades.append(
-                {
-                    "ts": str(ctx["start"].iloc[-1]),
-                    "mode": mode,
-                    "symbol": symbol,
-                    "side": side,
-                    "entry": entry,
-                    "tp": tp,
-                    "sl": sl,
-                    "result": sim["result"],
-                    "pnl": float(pnl_net),
-                    "bars": sim["bars"],
-                }
-            )
-        i += step_bars
+    # Features are precomputed on df, so signals only need a bounded tail
+    ctx_bars = int(mcfg.get("ctx_bars", 100))
+    run = partial(
+        _run_window, mode=mode, symbol=symbol, mcfg=mcfg,
+        horizon_bars=horizon_bars, ctx_bars=ctx_bars, testnet=testnet,
+        cost=fee_rt + 2 * slip_rt,
+    )
+    slices = [
+        df.iloc[i:i + test_bars].reset_index(drop=True)
+        for i in range(train_bars, len(df) - test_bars, step_bars)
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(slices))
 
     outdir = ROOT / "reports"
     outdir.mkdir(parents=True, exist_ok=True)
     ts = int(time.time())
-    if trades:
-        import pandas as _pd
+    csv_out = outdir / f"walk_{mode}_{ts}.csv"
+    pnls = [np.empty(0)]
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        # Both map()s yield windows in order, so rows stream out in order
+        results = pool.map(run, slices) if pool else map(run, slices)
+        with open(csv_out, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh, lineterminator="\n")
+            writer.writerow(_CSV_COLUMNS)
+            for cols in results:
+                pnls.append(cols["pnl"])
+                _write_trades(writer, cols, mode, symbol)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    pnl = np.concatenate(pnls)
+    n_trades = len(pnl)
+    # Compound in log space: one pass, less rounding drift than a running
+    # product over many trades
+    eq = float(np.exp(np.log1p(pnl).sum()))
 
-        dftr = _pd.DataFrame(trades)
-        wr = float((dftr["pnl"] > 0).mean())
-        pnl_sum = float(dftr["pnl"].sum())
-        avg = float(dftr["pnl"].mean())
+    if n_trades:
         m = {
             "mode": mode,
             "symbol": symbol,
             "timeframe": timeframe,
-            "trades": int(len(trades)),
-            "winrate": wr,
-            "pnl_sum": pnl_sum,
-            "avg_pnl": avg,
+            "trades": int(n_trades),
+            "winrate": float((pnl > 0).mean()),
+            "pnl_sum": float(pnl.sum()),
+            "avg_pnl": float(pnl.mean()),
             "equity_final": float(eq),
         }
         (outdir / f"walk_{mode}_{ts}.json").write_text(
             json.dumps(m, indent=2), encoding="utf-8"
         )
-        (outdir / f"walk_{mode}_{ts}.csv").write_text(
-            dftr.to_csv(index=False), encoding="utf-8"
-        )
     else:
+        csv_out.unlink()
         m = {"mode": mode, "trades": 0, "note": "No trades generated"}
         (outdir / f"walk_{mode}_{ts}.json").write_text(
             json.dumps(m, indent=2), encoding="utf-8"
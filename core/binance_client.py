@@ -5,8 +5,10 @@ Menggunakan ccxt untuk trading dan REST API untuk data
 """
 import os
 import time
+from functools import lru_cache
 import ccxt
 import pandas as pd
+from requests.adapters import HTTPAdapter
 from typing import Any, Dict, List
 from core.logger import get_logger
 
@@ -47,7 +49,13 @@ class BinanceClient:
                 }
             }
 
-        return ccxt.binance(config)
+        exchange = ccxt.binance(config)
+        # Keep-alive pool so repeated REST calls reuse TLS connections
+        adapter = HTTPAdapter(
+            pool_connections=20, pool_maxsize=20, max_retries=0
+        )
+        exchange.session.mount("https://", adapter)
+        return exchange
 
     def get_klines(
         self, symbol: str, timeframe: str = "5m", limit: int = 300
@@ -312,6 +320,16 @@ class BinanceClient:
             return False
 
 
-def get_binance_client(testnet: bool = True) -> BinanceClient:
-    """Get Binance client instance"""
+@lru_cache(maxsize=4)
+def _shared_client(testnet: bool, api_key: str, api_secret: str):
     return BinanceClient(testnet=testnet)
+
+
+def get_binance_client(testnet: bool = True) -> BinanceClient:
+    """Get Binance client instance (shared per testnet flag and
+    credentials)"""
+    return _shared_client(
+        bool(testnet),
+        os.getenv("BINANCE_API_KEY", ""),
+        os.getenv("BINANCE_API_SECRET", ""),
+    )
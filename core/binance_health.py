@@ -2,15 +2,44 @@
 """
 Binance-specific health check functions
 """
+import asyncio
+import functools
 import os
 import time
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, Tuple
 from .binance_client import get_binance_client
 from .logger import get_logger
 
 log = get_logger("binance_health")
 
+HEALTH_TTL_SEC = float(os.getenv("BINANCE_HEALTH_TTL", "3"))
+_TTL_CACHE: Dict[tuple, Tuple[float, Dict[str, Any]]] = {}
 
+
+def ttl_cache(seconds: float = HEALTH_TTL_SEC):
+    """Memoize a check's result for a few seconds so bursty pollers
+    don't re-issue identical REST calls"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+            hit = _TTL_CACHE.get(key)
+            now = time.monotonic()
+            if hit is not None and now - hit[0] < seconds:
+                return hit[1]
+            result = fn(*args, **kwargs)
+            _TTL_CACHE[key] = (now, result)
+            return result
+        return wrapper
+    return deco
+
+
+def clear_health_cache() -> None:
+    _TTL_CACHE.clear()
+
+
+@ttl_cache()
 def check_binance_connection(testnet: bool = True) -> Dict[str, Any]:
     """Check Binance API connection"""
     try:
@@ -47,7 +76,7 @@ def check_binance_connection(testnet: bool = True) -> Dict[str, Any]:
             }
 
     except Exception as e:
-        log.error(f"Binance health check error: {e}")
+        log.error("Binance health check error: %s", e)
         return {
             "status": "error",
             "message": f"Binance health check failed: {str(e)}",
@@ -57,6 +86,7 @@ def check_binance_connection(testnet: bool = True) -> Dict[str, Any]:
         }
 
 
+@ttl_cache()
 def check_binance_balance(testnet: bool = True) -> Dict[str, Any]:
     """Check Binance account balance"""
     try:
@@ -94,7 +124,7 @@ def check_binance_balance(testnet: bool = True) -> Dict[str, Any]:
         }
 
     except Exception as e:
-        log.error(f"Binance balance check error: {e}")
+        log.error("Binance balance check error: %s", e)
         return {
             "status": "error",
             "message": f"Binance balance check failed: {str(e)}",
@@ -102,6 +132,7 @@ def check_binance_balance(testnet: bool = True) -> Dict[str, Any]:
         }
 
 
+@ttl_cache()
 def check_binance_positions(testnet: bool = True) -> Dict[str, Any]:
     """Check Binance open positions"""
     try:
@@ -114,21 +145,28 @@ def check_binance_positions(testnet: bool = True) -> Dict[str, Any]:
             }
 
         positions = client.get_positions()
-        open_positions = [p for p in positions if float(p.get("size", 0)) > 0]
+        # One pass: count open positions, keep only the first 5 as sample
+        open_count = 0
+        sample = []
+        for p in positions:
+            if float(p.get("size", 0)) > 0:
+                open_count += 1
+                if len(sample) < 5:
+                    sample.append(p)
 
         return {
             "status": "healthy",
-            "message": f"Binance positions: {len(open_positions)} open",
+            "message": f"Binance positions: {open_count} open",
             "details": {
                 "total_positions": len(positions),
-                "open_positions": len(open_positions),
-                "positions": open_positions[:5],  # Limit to first 5
+                "open_positions": open_count,
+                "positions": sample,
                 "testnet": testnet,
             },
         }
 
     except Exception as e:
-        log.error(f"Binance positions check error: {e}")
+        log.error("Binance positions check error: %s", e)
         return {
             "status": "error",
             "message": f"Binance positions check failed: {str(e)}",
@@ -136,6 +174,7 @@ def check_binance_positions(testnet: bool = True) -> Dict[str, Any]:
         }
 
 
+@ttl_cache()
 def check_binance_market_data(
     symbol: str = "BTCUSDT", testnet: bool = True
 ) -> Dict[str, Any]:
@@ -149,18 +188,10 @@ def check_binance_market_data(
                 "details": {},
             }
 
-        # Test ticker
-        ticker = client.get_ticker(symbol)
-        if not ticker or not ticker.get("last"):
-            return {
-                "status": "error",
-                "message": f"Failed to fetch {symbol} ticker from Binance",
-                "details": {"symbol": symbol, "testnet": testnet},
-            }
-
-        # Test klines
+        # One klines request proves data is flowing; its last close
+        # stands in for the ticker price
         klines = client.get_klines(symbol, "5m", 10)
-        if klines.empty:
+        if len(klines) == 0:
             return {
                 "status": "error",
                 "message": f"Failed to fetch {symbol} klines from Binance",
@@ -172,14 +203,14 @@ def check_binance_market_data(
             "message": f"Binance market data for {symbol} available",
             "details": {
                 "symbol": symbol,
-                "last_price": float(ticker.get("last", 0)),
+                "last_price": float(klines["close"].iat[-1]),
                 "klines_count": len(klines),
                 "testnet": testnet,
             },
         }
 
     except Exception as e:
-        log.error(f"Binance market data check error: {e}")
+        log.error("Binance market data check error: %s", e)
         return {
             "status": "error",
             "message": f"Binance market data check failed: {str(e)}",
@@ -187,23 +218,61 @@ def check_binance_market_data(
         }
 
 
-def get_binance_health_summary(testnet: bool = True) -> Dict[str, Any]:
-    """Get comprehensive Binance health summary"""
-    checks = {
-        "connection": check_binance_connection(testnet),
-        "balance": check_binance_balance(testnet),
-        "positions": check_binance_positions(testnet),
-        "market_data": check_binance_market_data("BTCUSDT", testnet),
+CHECK_TIMEOUT_SEC = 5.0
+
+
+def _run_checks(testnet: bool) -> Dict[str, Dict[str, Any]]:
+    """Run every Binance check concurrently on a dedicated pool; checks
+    still running after CHECK_TIMEOUT_SEC are reported and abandoned, so
+    the caller is never held longer than that"""
+    calls = {
+        "connection": (check_binance_connection, (testnet,)),
+        "balance": (check_binance_balance, (testnet,)),
+        "positions": (check_binance_positions, (testnet,)),
+        "market_data": (check_binance_market_data, ("BTCUSDT", testnet)),
     }
+    ex = ThreadPoolExecutor(max_workers=len(calls))
+    futures = {
+        name: ex.submit(fn, *args) for name, (fn, args) in calls.items()
+    }
+    wait(futures.values(), timeout=CHECK_TIMEOUT_SEC)
+    ex.shutdown(wait=False, cancel_futures=True)
+
+    checks = {}
+    for name, fut in futures.items():
+        if not fut.done():
+            log.warning("Binance %s check timed out", name)
+            checks[name] = {
+                "status": "error",
+                "message": (
+                    f"Binance {name} check timed out after "
+                    f"{CHECK_TIMEOUT_SEC:.0f}s"
+                ),
+                "details": {"error": "timeout"},
+            }
+        elif fut.exception() is not None:
+            err = fut.exception()
+            checks[name] = {
+                "status": "error",
+                "message": f"Binance {name} check failed: {err}",
+                "details": {"testnet": testnet, "error": str(err)},
+            }
+        else:
+            checks[name] = fut.result()
+    return checks
+
 
-    # Determine overall status
-    statuses = [check.get("status", "unknown") for check in checks.values()]
-    if "error" in statuses:
-        overall_status = "error"
-    elif "warning" in statuses:
-        overall_status = "warning"
-    else:
-        overall_status = "healthy"
+def _summarize(checks: Dict[str, Dict[str, Any]],
+               testnet: bool) -> Dict[str, Any]:
+    # Determine overall status: error > warning > healthy
+    overall_status = "healthy"
+    for check in checks.values():
+        status = check.get("status")
+        if status == "error":
+            overall_status = "error"
+            break
+        if status == "warning":
+            overall_status = "warning"
 
     return {
         "overall_status": overall_status,
@@ -212,3 +281,61 @@ def get_binance_health_summary(testnet: bool = True) -> Dict[str, Any]:
         "timestamp": time.time(),
         "checks": checks,
     }
+
+
+async def get_binance_health_summary_async(
+    testnet: bool = True
+) -> Dict[str, Any]:
+    """Run all Binance checks concurrently and summarize them"""
+    checks = await asyncio.to_thread(_run_checks, testnet)
+    return _summarize(checks, testnet)
+
+
+REFRESH_INTERVAL_SEC = 15.0
+_LATEST: Dict[bool, Dict[str, Any]] = {}
+_REFRESHERS: Dict[bool, "asyncio.Task"] = {}
+
+
+async def _refresher(testnet: bool, interval: float) -> None:
+    while True:
+        try:
+            _LATEST[testnet] = await get_binance_health_summary_async(
+                testnet
+            )
+        except Exception as e:
+            log.error("Binance health refresh failed: %s", e)
+        await asyncio.sleep(interval)
+
+
+def start_health_refresher(
+    testnet: bool = True, interval: float = REFRESH_INTERVAL_SEC
+) -> "asyncio.Task":
+    """Publish a fresh summary every `interval` seconds from a background
+    task on the running loop (started once per testnet flag)"""
+    task = _REFRESHERS.get(testnet)
+    if task is None or task.done():
+        task = asyncio.get_running_loop().create_task(
+            _refresher(testnet, interval)
+        )
+        _REFRESHERS[testnet] = task
+    return task
+
+
+def get_latest_health_summary(testnet: bool = True) -> Dict[str, Any]:
+    """Last snapshot published by the refresher, without any I/O"""
+    return _LATEST.get(testnet) or {
+        "overall_status": "unknown",
+        "exchange": "binance",
+        "testnet": testnet,
+        "timestamp": 0,
+        "checks": {},
+    }
+
+
+def get_binance_health_summary(testnet: bool = True) -> Dict[str, Any]:
+    """Get comprehensive Binance health summary; served from the background
+    refresher when one is running, otherwise checks run concurrently"""
+    task = _REFRESHERS.get(testnet)
+    if task is not None and not task.done() and testnet in _LATEST:
+        return _LATEST[testnet]
+    return _summarize(_run_checks(testnet), testnet)
@@ -4,10 +4,22 @@ Fixes for circular import issues in core modules
 Mengatasi masalah circular import yang menyebabkan crash saat deployment
 """
 
+import json
+import logging
 import sys
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
+
+try:
+    import orjson
+except Exception:
+    orjson = None  # fallback to stdlib json
+
+_TRUTHY = frozenset({"true", "1", "yes", "on"})
+_FAILED_IMPORTS: set = set()
 
 # Add current directory to Python path
 if "." not in sys.path:
@@ -16,83 +28,127 @@ if "." not in sys.path:
 
 def safe_import_core_module(module_name: str, fallback=None):
     """Safely import core modules with circular import protection"""
+    # Already-imported and known-broken modules skip the import machinery
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    if module_name in _FAILED_IMPORTS:
+        return fallback
     try:
-        # Check if module is already imported
-        if module_name in sys.modules:
-            return sys.modules[module_name]
-
         # Import with error handling
         module = __import__(module_name, fromlist=[""])
         return module
     except ImportError as e:
         print(f"Warning: Could not import {module_name}: {e}")
-        return fallback
     except Exception as e:
         print(f"Warning: Error importing {module_name}: {e}")
-        return fallback
+    _FAILED_IMPORTS.add(module_name)
+    return fallback
+
+
+class FallbackLogger:
+    """Print-based logger used when even logging setup fails"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def _emit(self, level, msg, args):
+        print(f"[{level}] {self.name}: {msg % args if args else msg}")
+
+    def info(self, msg, *args):
+        self._emit("INFO", msg, args)
+
+    def warning(self, msg, *args):
+        self._emit("WARNING", msg, args)
+
+    def error(self, msg, *args):
+        self._emit("ERROR", msg, args)
+
+    def debug(self, msg, *args):
+        self._emit("DEBUG", msg, args)
+
+
+_get_logger = None
 
 
 def get_logger_safe(name: str):
     """Get logger with circular import protection"""
+    global _get_logger
     try:
-        from core.logger import get_logger
+        if _get_logger is None:
+            from core.logger import get_logger
 
-        return get_logger(name)
+            _get_logger = get_logger
+        return _get_logger(name)
     except ImportError:
         # Fallback logger
-        import logging
-
         return logging.getLogger(name)
     except Exception:
         # Ultimate fallback
-        class FallbackLogger:
-            def __init__(self, name):
-                self.name = name
-
-            def info(self, msg):
-                print(f"[INFO] {self.name}: {msg}")
-
-            def warning(self, msg):
-                print(f"[WARNING] {self.name}: {msg}")
-
-            def error(self, msg):
-                print(f"[ERROR] {self.name}: {msg}")
-
-            def debug(self, msg):
-                print(f"[DEBUG] {self.name}: {msg}")
-
         return FallbackLogger(name)
 
 
 def load_json_safe(path: str, default: Any = None) -> Any:
     """Load JSON with error handling"""
     try:
-        import json
-
-        with open(path, "r") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            data = f.read()
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
     except Exception:
         return default
 
 
 def save_json_safe(path: str, obj: Any) -> bool:
     """Save JSON with error handling"""
+    tmp = None
     try:
-        import json
-
-        Path(path).parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(obj, f, indent=2)
+        parent = Path(path).parent
+        parent.mkdir(parents=True, exist_ok=True)
+        if orjson is not None:
+            data = orjson.dumps(
+                obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        else:
+            data = json.dumps(obj, indent=2).encode("utf-8")
+        # Unique temp file so concurrent savers never share one
+        fd, tmp = tempfile.mkstemp(
+            dir=parent, prefix=Path(path).name + ".", suffix=".tmp"
+        )
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, path)
+        tmp = None
         return True
     except Exception:
         return False
+    finally:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def get_state_snapshot() -> Dict[str, Any]:
+    """data/state.json loaded once, for reading several fields"""
+    return load_json_safe("data/state.json", {}) or {}
+
+
+def get_globals_snapshot() -> Dict[str, Any]:
+    """config/global.json loaded once, for reading several fields"""
+    return load_json_safe("config/global.json", {}) or {}
 
 
 def get_config_safe(mode: str = "global") -> Dict[str, Any]:
     """Get configuration with circular import protection"""
     try:
         if mode == "global":
-            return load_json_safe("config/global.json", {})
+            return get_globals_snapshot()
         else:
             return load_json_safe(f"config/{mode}.json", {})
     except Exception:
@@ -108,27 +164,25 @@ def get_exchange_safe() -> str:
         return os.getenv("EXCHANGE", "bybit")
 
 
+def _env_testnet() -> bool:
+    return os.getenv("BYBIT_TESTNET", "true").strip().lower() in _TRUTHY
+
+
 def get_testnet_safe() -> bool:
     """Get testnet setting with fallback"""
     try:
         config = get_config_safe("global")
-        return config.get(
-            "testnet",
-            os.getenv("BYBIT_TESTNET", "true").lower() in (
-                "true", "1", "yes"
-            ),
-        )
+        if "testnet" in config:
+            return config["testnet"]
+        return _env_testnet()
     except Exception:
-        return os.getenv("BYBIT_TESTNET", "true").lower() in (
-            "true", "1", "yes"
-        )
+        return _env_testnet()
 
 
 def get_mode_safe() -> str:
     """Get trading mode with fallback"""
     try:
-        state = load_json_safe("data/state.json", {})
-        return state.get("mode", "scalping")
+        return get_state_snapshot().get("mode", "scalping")
     except Exception:
         return "scalping"
 
@@ -136,8 +190,7 @@ def get_mode_safe() -> str:
 def get_leverage_safe() -> str:
     """Get leverage setting with fallback"""
     try:
-        state = load_json_safe("data/state.json", {})
-        return state.get("leverage", "auto")
+        return get_state_snapshot().get("leverage", "auto")
     except Exception:
         return "auto"
 
@@ -167,17 +220,23 @@ def get_equity_safe() -> float:
 def get_running_safe() -> bool:
     """Get running status with fallback"""
     try:
-        state = load_json_safe("data/state.json", {})
-        return not state.get("paused", False)
+        return not get_state_snapshot().get("paused", False)
     except Exception:
         return True
 
 
+def _try_import(module: str) -> Tuple[str, bool]:
+    try:
+        __import__(module)
+        return module, True
+    except Exception:
+        return module, False
+
+
 def validate_imports() -> Dict[str, bool]:
     """Validate all critical imports"""
-    results = {}
-
-    # Test core module imports
+    # Test core module imports (serially: they import each other, and
+    # concurrent imports of a circular chain can deadlock)
     core_modules = [
         "core.logger",
         "core.utils",
@@ -185,23 +244,13 @@ def validate_imports() -> Dict[str, bool]:
         "core.health_check",
         "core.import_fixes",
     ]
+    results = dict(map(_try_import, core_modules))
 
-    for module in core_modules:
-        try:
-            __import__(module)
-            results[module] = True
-        except Exception:
-            results[module] = False
-
-    # Test external dependencies
+    # Test external dependencies; heavy, independent C-extension imports
+    # overlap well in threads
     external_deps = ["psutil", "requests", "pandas", "numpy", "websocket"]
-
-    for dep in external_deps:
-        try:
-            __import__(dep)
-            results[dep] = True
-        except Exception:
-            results[dep] = False
+    with ThreadPoolExecutor(max_workers=len(external_deps)) as ex:
+        results.update(ex.map(_try_import, external_deps))
 
     return results
 
@@ -222,17 +271,19 @@ def fix_circular_imports():
             logger.info("Configuration files validated")
             fixes_applied.append("config_validation")
         else:
-            logger.warning(f"Configuration issues: {config_status}")
-
-        # Fix 3: Test critical functions
-        exchange = get_exchange_safe()
-        mode = get_mode_safe()
-        symbol = get_symbol_safe()
+            logger.warning("Configuration issues: %s", config_status)
+
+        # Fix 3: Test critical functions (one read per file)
+        state = get_state_snapshot()
+        globals_ = get_globals_snapshot()
+        exchange = globals_.get("exchange", os.getenv("EXCHANGE", "bybit"))
+        mode = state.get("mode", "scalping")
+        symbol = globals_.get("symbol", "BTCUSDT")
         equity = get_equity_safe()
 
         logger.info(
-            f"System state: exchange={exchange}, mode={mode}, "
-            f"symbol={symbol}, equity={equity}"
+            "System state: exchange=%s, mode=%s, symbol=%s, equity=%s",
+            exchange, mode, symbol, equity,
         )
         fixes_applied.append("state_validation")
 
@@ -241,7 +292,7 @@ def fix_circular_imports():
         failed_imports = [k for k, v in import_status.items() if not v]
 
         if failed_imports:
-            logger.warning(f"Failed imports: {failed_imports}")
+            logger.warning("Failed imports: %s", failed_imports)
         else:
             logger.info("All imports validated successfully")
             fixes_applied.append("import_validation")
@@ -255,7 +306,7 @@ def fix_circular_imports():
 
     except Exception as e:
         logger = get_logger_safe("circular_import_fixes")
-        logger.error(f"Circular import fixes failed: {e}")
+        logger.error("Circular import fixes failed: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -4,9 +4,33 @@ Common utilities shared across modules
 
 import json
 import logging
+import os
+import tempfile
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except Exception:
+    orjson = None  # fallback to stdlib json
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    return json.dumps(obj, indent=2).encode("utf-8")
+
 
 def load_json(path: str, default: Any = None) -> Any:
     """Load JSON file with error handling"""
@@ -14,20 +38,38 @@ def load_json(path: str, default: Any = None) -> Any:
         p = Path(path)
         if not p.exists():
             return default
-        return json.loads(p.read_text(encoding="utf-8"))
+        return _loads(p.read_bytes())
     except Exception:
         return default
 
 
 def save_json(path: str, obj: Any) -> bool:
     """Save JSON file with error handling"""
+    tmp = None
     try:
         p = Path(path)
         p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(json.dumps(obj, indent=2), encoding="utf-8")
+        # Unique temp file, fsync, then swap in: a crash never truncates
+        # path and concurrent savers never share a temp file
+        fd, tmp = tempfile.mkstemp(
+            dir=p.parent, prefix=p.name + ".", suffix=".tmp"
+        )
+        with os.fdopen(fd, "wb") as f:
+            f.write(_dumps(obj))
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, p)
+        tmp = None
         return True
     except Exception:
         return False
+    finally:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
 
 
 def get_logger(name: str) -> logging.Logger:
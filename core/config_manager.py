@@ -1,8 +1,60 @@
-from .utils import load_json, save_json
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+
+from .utils import load_json, load_json_cached, save_json, update_json
+
+STATE_PATH = "data/state.json"
+GLOBAL_PATH = "config/global.json"
+
+_TRUTHY = frozenset({"true", "1", "yes", "on"})
+_FALSY = frozenset({"false", "0", "no", "off"})
+
+# exchange -> env key names and (testnet, mainnet) REST hosts
+_EXCHANGE_META = {
+    "binance": {
+        "api_key": "BINANCE_API_KEY",
+        "api_secret": "BINANCE_API_SECRET",
+        "hosts": ("https://testnet.binancefuture.com",
+                  "https://fapi.binance.com"),
+    },
+    "bybit": {
+        "api_key": "BYBIT_API_KEY",
+        "api_secret": "BYBIT_API_SECRET",
+        "hosts": ("https://api-testnet.bybit.com", "https://api.bybit.com"),
+    },
+}
+
+
+def _stat_key(path: str) -> tuple:
+    """(mtime_ns, size) of path, used to key derived-value caches"""
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return -1, -1
+
+
+def update_state(**fields) -> dict:
+    """Batch-update data/state.json (one read, one write)"""
+    return update_json(STATE_PATH, **fields)
+
+
+def update_global(**fields) -> dict:
+    """Batch-update config/global.json (one read, one write)"""
+    return update_json(GLOBAL_PATH, **fields)
+
+
+@contextmanager
+def config_transaction(path: str = STATE_PATH):
+    """Yield the loaded dict and save it once on a clean exit"""
+    data = load_json(path, {})
+    yield data
+    save_json(path, data)
 
 
 def get_mode() -> str:
-    state = load_json("data/state.json", {})
+    state = load_json_cached("data/state.json", {})
     return state.get("mode", "scalping")
 
 
@@ -13,7 +65,7 @@ def set_mode(mode: str):
 
 
 def get_leverage():
-    state = load_json("data/state.json", {})
+    state = load_json_cached("data/state.json", {})
     return state.get("leverage", "auto")
 
 
@@ -30,7 +82,7 @@ def set_testnet(flag: bool):
 
 
 def get_symbol():
-    g = load_json("config/global.json", {})
+    g = load_json_cached("config/global.json", {})
     return g.get("symbol", "BTCUSDT")
 
 
@@ -40,11 +92,16 @@ def set_symbol(sym: str):
     save_json("config/global.json", g)
 
 
+@lru_cache(maxsize=32)
+def _exchange(sig: tuple) -> str:
+    g = load_json_cached(GLOBAL_PATH, {})
+    return g.get("exchange", "bybit").lower()
+
+
 def get_exchange() -> str:
     """Get current exchange with fallback"""
     try:
-        g = load_json("config/global.json", {})
-        return g.get("exchange", "bybit").lower()
+        return _exchange(_stat_key(GLOBAL_PATH))
     except Exception as e:
         print(f"Warning: Failed to get exchange config: {e}")
         return "bybit"
@@ -69,16 +126,14 @@ def set_exchange(name: str):
 
 def get_binance_testnet() -> bool:
     """Get Binance testnet setting from environment or config."""
-    import os
-
     env_val = os.getenv("BINANCE_TESTNET", "").strip().lower()
-    if env_val in ("true", "1", "yes", "on"):
+    if env_val in _TRUTHY:
         return True
-    elif env_val in ("false", "0", "no", "off"):
+    elif env_val in _FALSY:
         return False
 
     # Fallback to global config
-    g = load_json("config/global.json", {})
+    g = load_json_cached("config/global.json", {})
     return bool(g.get("binance_testnet", True))
 
 
@@ -92,38 +147,31 @@ def set_binance_testnet(testnet: bool):
 def get_exchange_config() -> dict:
     """Get exchange-specific configuration."""
     exchange = get_exchange()
-    g = load_json("config/global.json", {})
-
     if exchange == "binance":
-        return {
-            "exchange": "binance",
-            "testnet": get_binance_testnet(),
-            "api_key": "BINANCE_API_KEY",
-            "api_secret": "BINANCE_API_SECRET",
-            "base_url": (
-                "https://testnet.binancefuture.com"
-                if get_binance_testnet()
-                else "https://fapi.binance.com"
-            ),
-        }
+        testnet = get_binance_testnet()
     else:
-        return {
-            "exchange": "bybit",
-            "testnet": bool(g.get("testnet", True)),
-            "api_key": "BYBIT_API_KEY",
-            "api_secret": "BYBIT_API_SECRET",
-            "base_url": (
-                "https://api-testnet.bybit.com"
-                if bool(g.get("testnet", True))
-                else "https://api.bybit.com"
-            ),
-        }
+        exchange = "bybit"
+        g = load_json_cached("config/global.json", {})
+        testnet = bool(g.get("testnet", True))
+    meta = _EXCHANGE_META[exchange]
+    return {
+        "exchange": exchange,
+        "testnet": testnet,
+        "api_key": meta["api_key"],
+        "api_secret": meta["api_secret"],
+        "base_url": meta["hosts"][0 if testnet else 1],
+    }
+
+
+@lru_cache(maxsize=32)
+def _watchlist(sig: tuple) -> tuple:
+    g = load_json_cached(GLOBAL_PATH, {})
+    wl = g.get("symbols", ["BTCUSDT", "ETHUSDT", "SOLUSDT"])
+    return tuple(dict.fromkeys([s.upper() for s in wl]))
 
 
 def get_watchlist():
-    g = load_json("config/global.json", {})
-    wl = g.get("symbols", ["BTCUSDT", "ETHUSDT", "SOLUSDT"])
-    return list(dict.fromkeys([s.upper() for s in wl]))
+    return list(_watchlist(_stat_key(GLOBAL_PATH)))
 
 
 def add_watchlist(sym: str):
@@ -143,7 +191,7 @@ def remove_watchlist(sym: str):
 
 
 def get_auto_pairs():
-    g = load_json("config/global.json", {})
+    g = load_json_cached("config/global.json", {})
     return bool(g.get("auto_pairs", True))
 
 
@@ -154,7 +202,7 @@ def set_auto_pairs(flag: bool):
 
 
 def get_topn():
-    g = load_json("config/global.json", {})
+    g = load_json_cached("config/global.json", {})
     return int(g.get("top_n", 3))
 
 
@@ -165,7 +213,7 @@ def set_topn(n: int):
 
 
 def get_pair_update_interval_min():
-    g = load_json("config/global.json", {})
+    g = load_json_cached("config/global.json", {})
     return int(g.get("pair_update_interval_min", 15))
 
 
@@ -177,8 +225,8 @@ def set_pair_update_interval_min(m: int):
 
 
 def get_leverage_caps():
-    g = load_json("config/global.json", {})
-    return g.get("leverage_caps", {"scalping": 50, "adaptive": 50})
+    g = load_json_cached("config/global.json", {})
+    return dict(g.get("leverage_caps", {"scalping": 50, "adaptive": 50}))
 
 
 def get_leverage_cap_for_mode(mode: str):
@@ -199,7 +247,7 @@ def clamp_leverage(mode: str, lev):
 
 
 def get_running():
-    g = load_json("config/global.json", {})
+    g = load_json_cached("config/global.json", {})
     return bool(g.get("running", True))
 
 
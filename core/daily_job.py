@@ -1,36 +1,54 @@
 # import os  # Unused import
 # import datetime  # Unused import
+import asyncio
+
 from .reporting import per_mode_stats, save_equity_chart
 from .notifier import telegram_send_direct, telegram_send_photo_direct
 from .logger import get_logger
 
 log = get_logger("daily_job")
 
+_LINE_FMT = (
+    "{mode}: trades={trades}, winrate={winrate:.2%}, "
+    "pnl={pnl:.4f}, sharpe~={sharpe_like:.2f}"
+)
 
-def run():
+
+async def _render_chart(path: str):
+    try:
+        return await asyncio.to_thread(save_equity_chart, path)
+    except Exception as e:
+        log.warning(f"chart render failed: {e}")
+        return None
+
+
+async def run_async():
     stats = per_mode_stats()
     if not stats:
         telegram_send_direct(
             "[kang_bot] Daily stats: belum ada data closed trades."
         )
         return
-    lines = []
-    for m, s in stats.items():
-        lines.append(
-            f"{m}: trades={s['trades']}, winrate={s['winrate']:.2%}, "
-            f"pnl={s['pnl']:.4f}, sharpe~={s['sharpe_like']:.2f}"
-        )
-    msg = "[kang_bot] Daily stats\n" + "\n".join(lines)
-    telegram_send_direct(msg)
-    # Chart
+    msg = "[kang_bot] Daily stats\n" + "\n".join(
+        _LINE_FMT.format(mode=m, **s) for m, s in stats.items()
+    )
+    # Render the chart while the text message is in flight
     path = "/mnt/data/equity.png"
+    _, p = await asyncio.gather(
+        asyncio.to_thread(telegram_send_direct, msg), _render_chart(path)
+    )
     try:
-        p = save_equity_chart(path)
         if p:
-            telegram_send_photo_direct(p, caption="Equity curve")
+            await asyncio.to_thread(
+                telegram_send_photo_direct, p, caption="Equity curve"
+            )
     except Exception as e:
         log.warning(f"chart send failed: {e}")
 
 
+def run():
+    asyncio.run(run_async())
+
+
 if __name__ == "__main__":
     run()
@@ -1,83 +1,166 @@
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, Optional
+
 import pandas as pd
 import numpy as np
-from pybit.unified_trading import HTTP
-import requests
-from ta.trend import EMAIndicator, MACD
-from ta.volatility import AverageTrueRange
-from ta.momentum import RSIIndicator
+from ._indicators_nb import compute_all
+from ._njit import NUMBA_AVAILABLE
 from .logger import get_logger
 from .config_manager import get_exchange
 
+try:
+    import orjson
+except Exception:
+    orjson = None  # fallback to requests' stdlib json
+
 log = get_logger("data_pipeline")
 
 
+# requests/pybit are imported on first use so that importing this module
+# (e.g. only for add_indicators) does not pull in the HTTP stacks
+
+
+@lru_cache(maxsize=1)
+def _session():
+    """Keep-alive pool shared by all REST klines requests"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.1),
+        ),
+    )
+    return session
+
+
+@lru_cache(maxsize=4)
+def _bybit_http(testnet: bool, api_key: str, api_secret: str):
+    from pybit.unified_trading import HTTP
+
+    return HTTP(testnet=testnet, api_key=api_key, api_secret=api_secret)
+
+
 def _http_client(testnet: bool):
-    return HTTP(
-        testnet=testnet,
-        api_key=os.getenv("BYBIT_API_KEY"),
-        api_secret=os.getenv("BYBIT_API_SECRET"),
+    """Shared pybit client per testnet flag and credentials"""
+    return _bybit_http(
+        bool(testnet),
+        os.getenv("BYBIT_API_KEY"),
+        os.getenv("BYBIT_API_SECRET"),
     )
 
 
+def reset_http_clients() -> None:
+    """Drop pooled pybit clients, e.g. after API keys were rotated"""
+    _bybit_http.cache_clear()
+
+
+def warm_http_client(testnet: bool = True) -> bool:
+    """Build the pybit client and open its TLS connection ahead of the
+    first klines request; call once at process start"""
+    if get_exchange() == "binance":
+        return False
+    try:
+        _http_client(testnet).get_server_time()
+        return True
+    except Exception as e:
+        log.warning(f"Bybit client warm-up failed: {e}")
+        return False
+
+
+# Interval names accepted by fetch_klines -> exchange interval codes
+_BINANCE_IV = MappingProxyType({
+    "1m": "1m",
+    "3m": "3m",
+    "5m": "5m",
+    "15m": "15m",
+    "30m": "30m",
+    "1h": "1h",
+    "60m": "1h",
+    "4h": "4h",
+})
+_BYBIT_IV = MappingProxyType({"5m": "5", "15m": "15", "60m": "60", "1h": "60"})
+
+
+# OHLC prices carry <= 8 significant digits, so float32 storage halves
+# the bytes streamed through the indicator passes; volume/turnover stay
+# float64. Set AUTHOR_FLOAT_DTYPE=float64 to keep full precision.
+PRICE_DTYPE = np.dtype(os.getenv("AUTHOR_FLOAT_DTYPE", "float32"))
+_PRICE_COLS = frozenset(("open", "high", "low", "close"))
+
+
+def _klines_frame(rows: list, cols: list) -> pd.DataFrame:
+    """Columnar OHLCV frame from exchange kline rows ([start_ms, ...])"""
+    arr = np.asarray(rows, dtype=object)[:, :len(cols)]
+    # one int64 cast, then a zero-copy datetime64[ms] view of it
+    ts_ms = arr[:, 0].astype(np.int64)
+    data = {"start": pd.DatetimeIndex(ts_ms.view("M8[ms]")).tz_localize("UTC")}
+    try:
+        vals = arr[:, 1:].astype(np.float64)
+        for c, v in zip(cols[1:], vals.T):
+            data[c] = v.astype(PRICE_DTYPE) if c in _PRICE_COLS else v
+        df = pd.DataFrame(data)
+    except (TypeError, ValueError):
+        # Malformed numbers: coerce per column like pd.to_numeric did
+        df = pd.DataFrame(data)
+        for i, c in enumerate(cols[1:], start=1):
+            v = pd.to_numeric(pd.Series(arr[:, i]), errors="coerce")
+            df[c] = v.astype(PRICE_DTYPE) if c in _PRICE_COLS else v
+    # Binance sends ascending bars and Bybit descending; sort only if
+    # neither holds
+    start = df["start"]
+    if start.is_monotonic_increasing:
+        return df
+    if start.is_monotonic_decreasing:
+        return df.iloc[::-1].reset_index(drop=True)
+    return df.sort_values("start").reset_index(drop=True)
+
+
 def fetch_klines(
     symbol: str, interval: str, limit: int = 300, testnet: bool = True
 ) -> pd.DataFrame:
     ex = get_exchange()
     if ex == "binance":
         try:
-            # Binance Futures intervals mapping
-            bmap = {
-                "1m": "1m",
-                "3m": "3m",
-                "5m": "5m",
-                "15m": "15m",
-                "30m": "30m",
-                "1h": "1h",
-                "60m": "1h",
-                "4h": "4h",
-            }
-            iv = bmap.get(interval, interval)
+            iv = _BINANCE_IV.get(interval, interval)
             base = (
                 "https://testnet.binancefuture.com"
                 if bool(testnet)
                 else "https://fapi.binance.com"
             )
-            resp = requests.get(
+            resp = _session().get(
                 f"{base}/fapi/v1/klines",
                 params={"symbol": symbol, "interval": iv, "limit": limit},
                 timeout=10,
             )
             resp.raise_for_status()
-            rows = resp.json() or []
+            if orjson is not None:
+                rows = orjson.loads(resp.content) if resp.content else []
+            else:
+                rows = resp.json() or []
             # Binance kline: [openTime, o, h, l, c, v, closeTime, ...]
-            data = []
-            for r in rows:
-                data.append(
-                    {
-                        "start": int(r[0]),
-                        "open": float(r[1]),
-                        "high": float(r[2]),
-                        "low": float(r[3]),
-                        "close": float(r[4]),
-                        "volume": float(r[5]),
-                    }
-                )
-            if not data:
+            if not rows:
                 return pd.DataFrame()
-            df = pd.DataFrame(data)
-            df["start"] = pd.to_datetime(
-                df["start"].astype(np.int64), unit="ms", utc=True
+            return _klines_frame(
+                rows, ["start", "open", "high", "low", "close", "volume"]
             )
-            df = df.sort_values("start").reset_index(drop=True)
-            return df
         except Exception as e:
             log.warning(f"Binance klines failed: {e}")
             return pd.DataFrame()
     # default: Bybit
     http = _http_client(testnet)
-    mapping = {"5m": "5", "15m": "15", "60m": "60", "1h": "60"}
-    iv = mapping.get(interval, interval)
+    iv = _BYBIT_IV.get(interval, interval)
     res = http.get_kline(
         category="linear", symbol=symbol, interval=iv, limit=limit
     )
@@ -86,69 +169,436 @@ def fetch_klines(
         log.warning("Empty klines from Bybit; returning dummy")
         return pd.DataFrame()
     cols = ["start", "open", "high", "low", "close", "volume", "turnover"]
-    df = pd.DataFrame(k, columns=cols)
-    for c in ["open", "high", "low", "close", "volume", "turnover"]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-    df["start"] = pd.to_datetime(
-        df["start"].astype(np.int64), unit="ms", utc=True
+    return _klines_frame(k, cols)
+
+
+def fetch_multi_tf(
+    symbol: str, tfs: Iterable[str], limit: int = 300, testnet: bool = True
+) -> Dict[str, pd.DataFrame]:
+    """Fetch several timeframes concurrently; wall time ~ slowest request"""
+    tfs = list(dict.fromkeys(tfs))
+    if len(tfs) <= 1:
+        return {tf: fetch_klines(symbol, tf, limit, testnet) for tf in tfs}
+    with ThreadPoolExecutor(max_workers=len(tfs)) as ex:
+        futures = {
+            tf: ex.submit(fetch_klines, symbol, tf, limit, testnet)
+            for tf in tfs
+        }
+        out = {}
+        for tf, fut in futures.items():
+            try:
+                out[tf] = fut.result()
+            except Exception as e:
+                log.warning(f"klines {symbol} {tf} failed: {e}")
+                out[tf] = pd.DataFrame()
+        return out
+
+
+def _ema(x: pd.Series, n: int) -> pd.Series:
+    """EMA seeded at the first bar, NaN until n bars are seen"""
+    return x.ewm(span=n, min_periods=n, adjust=False).mean()
+
+
+def _wilder_avgs(close: pd.Series, n: int):
+    """Wilder-smoothed average gain and loss of close-to-close moves"""
+    diff = close.diff().fillna(0.0)
+    avg_gain = diff.clip(lower=0.0).ewm(
+        alpha=1 / n, min_periods=n, adjust=False
+    ).mean()
+    avg_loss = (-diff).clip(lower=0.0).ewm(
+        alpha=1 / n, min_periods=n, adjust=False
+    ).mean()
+    return avg_gain, avg_loss
+
+
+def _rsi(close: pd.Series, n: int) -> pd.Series:
+    """Wilder RSI; 100 where the average loss is zero"""
+    avg_gain, avg_loss = _wilder_avgs(close, n)
+    rsi = np.where(avg_loss == 0, 100, 100 - 100 / (1 + avg_gain / avg_loss))
+    return pd.Series(rsi, index=close.index)
+
+
+def _atr(high: pd.Series, low: pd.Series, close: pd.Series, n: int):
+    """Wilder ATR seeded with the mean of the first n true ranges; 0 before"""
+    h = high.to_numpy(dtype=np.float64)
+    l_ = low.to_numpy(dtype=np.float64)
+    prev = close.shift().to_numpy(dtype=np.float64)
+    # fmax skips the NaN previous close on the first bar
+    tr = np.fmax(h - l_, np.fmax(np.abs(h - prev), np.abs(l_ - prev)))
+    atr = np.zeros(tr.shape[0])
+    if tr.shape[0] >= n:
+        seeded = tr[n - 1:].copy()
+        seeded[0] = tr[:n].mean()
+        atr[n - 1:] = (
+            pd.Series(seeded).ewm(alpha=1 / n, adjust=False).mean()
+        ).to_numpy()
+    return pd.Series(atr, index=close.index)
+
+
+def _add_indicators_nb(df: pd.DataFrame, mode: str, cfg: dict) -> None:
+    """EMA/RSI/MACD/ATR columns from the fused jitted kernel"""
+    win = _indicator_windows(mode, cfg)
+    ema_fast, ema_slow, rsi, atr, macd, macd_signal, macd_hist = compute_all(
+        df["high"].to_numpy(dtype=np.float64),
+        df["low"].to_numpy(dtype=np.float64),
+        df["close"].to_numpy(dtype=np.float64),
+        *(int(win.get(k, 0)) for k in (
+            "ema_fast", "ema_slow", "rsi", "atr",
+            "macd_fast", "macd_slow", "macd_signal",
+        )),
     )
-    df = df.sort_values("start").reset_index(drop=True)
-    return df
+    if mode in ("scalping", "adaptive"):
+        df["ema_fast"] = ema_fast
+        df["ema_slow"] = ema_slow
+        df["rsi"] = rsi
+        if mode == "adaptive":
+            df["macd"] = macd
+            df["macd_signal"] = macd_signal
+            df["macd_hist"] = macd_hist
+    df["atr"] = atr
+
+
+_INDICATOR_CACHE: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_INDICATOR_CACHE_SIZE = 16
+# Below this many bars hashing the frame costs about as much as the kernel
+_INDICATOR_CACHE_MIN_ROWS = 200
+_INDICATOR_LOCK = threading.Lock()
+
+
+def _indicator_cache_key(df: pd.DataFrame, mode: str, cfg: dict):
+    """Identify a frame by a digest of every column's values, so any
+    change (a still-forming last bar, a revised volume) is a miss"""
+    if len(df) < _INDICATOR_CACHE_MIN_ROWS:
+        return None
+    if mode not in ("scalping", "adaptive"):
+        return None
+    try:
+        digest = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        return (
+            mode,
+            tuple(sorted(cfg.get("indicators", {}).items())),
+            tuple(df.columns),
+            hash(digest.tobytes()),
+        )
+    except (TypeError, ValueError):
+        return None
+
 
+def indicator_lookback(mode: str, cfg: dict) -> int:
+    """Bars worth keeping for a live poll: 3x the longest window plus the
+    20-bar vol window, so the EMA/Wilder seeds have decayed"""
+    return 3 * max(_indicator_windows(mode, cfg).values()) + 20
 
-def add_indicators(df: pd.DataFrame, mode: str, cfg: dict) -> pd.DataFrame:
+
+def add_indicators(
+    df: pd.DataFrame,
+    mode: str,
+    cfg: dict,
+    max_lookback: Optional[int] = None,
+) -> pd.DataFrame:
+    """Indicator frame for df, minus its warm-up rows.
+
+    With `max_lookback` (see indicator_lookback) only the last that many
+    bars are used, so a growing history costs O(max_lookback) per call;
+    earlier bars are dropped from the result and the recurrences restart
+    at the cut. Leave it None when the full history is needed (training).
+    """
     if df.empty:
         return df
+    if max_lookback is not None and len(df) > max_lookback:
+        df = df.iloc[-max_lookback:].reset_index(drop=True)
+    key = _indicator_cache_key(df, mode, cfg)
+    if key is not None:
+        with _INDICATOR_LOCK:
+            hit = _INDICATOR_CACHE.get(key)
+            if hit is not None:
+                _INDICATOR_CACHE.move_to_end(key)
+                return hit.copy()
+    # Compute on a copy: hits never touch the caller's frame, so misses
+    # must not either
+    out = _add_indicators(df.copy(), mode, cfg)
+    if key is not None:
+        with _INDICATOR_LOCK:
+            _INDICATOR_CACHE[key] = out.copy()
+            if len(_INDICATOR_CACHE) > _INDICATOR_CACHE_SIZE:
+                _INDICATOR_CACHE.popitem(last=False)
+    return out
+
+
+def add_indicators_batch(
+    dfs: Dict[str, pd.DataFrame], mode: str, cfg: dict
+) -> Dict[str, pd.DataFrame]:
+    """add_indicators for several symbols at once; the jitted kernel
+    releases the GIL, so the per-symbol passes overlap across cores"""
+    if len(dfs) <= 1:
+        return {s: add_indicators(df, mode, cfg) for s, df in dfs.items()}
+    workers = min(len(dfs), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {
+            s: ex.submit(add_indicators, df, mode, cfg)
+            for s, df in dfs.items()
+        }
+        return {s: fut.result() for s, fut in futures.items()}
+
+
+def _add_indicators(df: pd.DataFrame, mode: str, cfg: dict) -> pd.DataFrame:
     close = df["close"]
     high = df["high"]
     low = df["low"]
-    if mode in ("scalping", "adaptive"):
-        ema_fast = (
-            EMAIndicator(
-                close=close,
-                window=cfg.get("indicators", {}).get("ema_fast", 9)
-            )
-            if cfg.get("indicators", {}).get("ema_fast")
-            else None
-        )
-        ema_slow_w = (
-            cfg.get("indicators", {}).get("ema_slow", None)
-            or cfg.get("indicators", {}).get("ema", None)
-            or 50
-        )
-        ema_slow = EMAIndicator(close=close, window=ema_slow_w)
-        df["ema_fast"] = ema_fast.ema_indicator() if ema_fast else np.nan
-        df["ema_slow"] = ema_slow.ema_indicator()
-        rsi_w = cfg.get("indicators", {}).get("rsi", 14)
-        df["rsi"] = RSIIndicator(close=close, window=rsi_w).rsi()
+    ind = cfg.get("indicators", {})
+    if NUMBA_AVAILABLE:
+        _add_indicators_nb(df, mode, cfg)
+    elif mode in ("scalping", "adaptive"):
+        ema_fast_w = ind.get("ema_fast")
+        ema_slow_w = ind.get("ema_slow", None) or ind.get("ema", None) or 50
+        df["ema_fast"] = _ema(close, ema_fast_w) if ema_fast_w else np.nan
+        df["ema_slow"] = _ema(close, ema_slow_w)
+        df["rsi"] = _rsi(close, ind.get("rsi", 14))
         if mode == "adaptive":
-            fast = cfg.get("indicators", {}).get("macd_fast", 12)
-            slow = cfg.get("indicators", {}).get("macd_slow", 26)
-            sig = cfg.get("indicators", {}).get("macd_signal", 9)
-            macd = MACD(
-                close=close,
-                window_slow=slow,
-                window_fast=fast,
-                window_sign=sig
-            )
-            df["macd"] = macd.macd()
-            df["macd_signal"] = macd.macd_signal()
-            df["macd_hist"] = macd.macd_diff()
+            fast = ind.get("macd_fast", 12)
+            slow = ind.get("macd_slow", 26)
+            sig = ind.get("macd_signal", 9)
+            macd = _ema(close, fast) - _ema(close, slow)
+            macd_signal = _ema(macd, sig)
+            df["macd"] = macd
+            df["macd_signal"] = macd_signal
+            df["macd_hist"] = macd - macd_signal
     # ATR (normalized)
-    atr_w = int(cfg.get("indicators", {}).get("atr", 14))
-    atr = AverageTrueRange(high=high, low=low, close=close, window=atr_w)
-    df["atr"] = atr.average_true_range()
+    if not NUMBA_AVAILABLE:
+        atr_w = int(ind.get("atr", 14))
+        df["atr"] = _atr(high, low, close, atr_w)
     df["atr_frac"] = df["atr"] / close
 
     # basic volatility features
     df["ret"] = close.pct_change()
     df["vol"] = df["ret"].rolling(20).std()
     df["mom"] = close.pct_change(10)
-    df.dropna(inplace=True)
-    return df
+    warmup = _warmup_bars(_indicator_windows(mode, cfg))
+    return df.iloc[warmup:].reset_index(drop=True)
+
+
+def _warmup_bars(win: dict) -> int:
+    """Leading rows left NaN by the indicator warm-ups (vol needs 20 ret)"""
+    warmup = 20
+    for k in ("ema_fast", "ema_slow", "rsi"):
+        if k in win:
+            warmup = max(warmup, int(win[k]) - 1)
+    if "macd_fast" in win:
+        slow = max(int(win["macd_fast"]), int(win["macd_slow"]))
+        warmup = max(warmup, slow + int(win["macd_signal"]) - 2)
+    return warmup
+
+
+def _indicator_windows(mode: str, cfg: dict) -> dict:
+    """Window lengths add_indicators uses for this mode/config"""
+    ind = cfg.get("indicators", {})
+    win = {"atr": int(ind.get("atr", 14))}
+    if mode in ("scalping", "adaptive"):
+        if ind.get("ema_fast"):
+            win["ema_fast"] = ind["ema_fast"]
+        win["ema_slow"] = (
+            ind.get("ema_slow", None) or ind.get("ema", None) or 50
+        )
+        win["rsi"] = ind.get("rsi", 14)
+        if mode == "adaptive":
+            win["macd_fast"] = ind.get("macd_fast", 12)
+            win["macd_slow"] = ind.get("macd_slow", 26)
+            win["macd_signal"] = ind.get("macd_signal", 9)
+    return win
+
+
+def _recurrence_state(raw: pd.DataFrame, win: dict) -> dict:
+    """Recurrence values after the last and second-to-last bar of raw"""
+    close = raw["close"]
+    series = {"close": close}
+    for k in ("ema_fast", "ema_slow"):
+        if k in win:
+            series[k] = _ema(close, win[k])
+    if "rsi" in win:
+        series["avg_gain"], series["avg_loss"] = _wilder_avgs(
+            close, win["rsi"]
+        )
+    if "macd_fast" in win:
+        fast = _ema(close, win["macd_fast"])
+        slow = _ema(close, win["macd_slow"])
+        series["macd_fast"] = fast
+        series["macd_slow"] = slow
+        series["macd_signal"] = _ema(fast - slow, win["macd_signal"])
+    series["atr"] = _atr(raw["high"], raw["low"], close, win["atr"])
+    start = raw["start"]
+    return {
+        "last": {k: float(v.iat[-1]) for k, v in series.items()},
+        "prev": {k: float(v.iat[-2]) for k, v in series.items()},
+        "start": start.iat[-1],
+        "step": start.iat[-1] - start.iat[-2],
+    }
 
 
-def add_mtf_features(df: pd.DataFrame, symbol: str, cfg: dict, testnet: bool):
+def _step_state(vals: dict, win: dict, h: float, l_: float, c: float):
+    """Advance every EMA/Wilder recurrence by one bar"""
+    pc = vals["close"]
+    out = {"close": c}
+    for k in ("ema_fast", "ema_slow", "macd_fast", "macd_slow"):
+        if k in vals:
+            out[k] = vals[k] + 2.0 / (win[k] + 1) * (c - vals[k])
+    if "macd_signal" in vals:
+        m = out["macd_fast"] - out["macd_slow"]
+        a = 2.0 / (win["macd_signal"] + 1)
+        out["macd_signal"] = vals["macd_signal"] + a * (
+            m - vals["macd_signal"]
+        )
+    if "avg_gain" in vals:
+        n = win["rsi"]
+        d = c - pc
+        out["avg_gain"] = vals["avg_gain"] + (
+            max(d, 0.0) - vals["avg_gain"]
+        ) / n
+        out["avg_loss"] = vals["avg_loss"] + (
+            max(-d, 0.0) - vals["avg_loss"]
+        ) / n
+    tr = max(h - l_, abs(h - pc), abs(l_ - pc))
+    out["atr"] = vals["atr"] + (tr - vals["atr"]) / win["atr"]
+    return out
+
+
+def _full_recompute(raw: pd.DataFrame, state: dict, win_key, win: dict,
+                    mode: str, cfg: dict) -> pd.DataFrame:
+    state.clear()
+    if len(raw) >= 2 and "start" in raw.columns:
+        state.update(_recurrence_state(raw, win), key=win_key)
+    return add_indicators(raw.reset_index(drop=True), mode, cfg)
+
+
+def add_indicators_incremental(
+    prev_df: pd.DataFrame,
+    new_bars: pd.DataFrame,
+    state: dict,
+    cfg: dict,
+    mode: str = "scalping",
+) -> pd.DataFrame:
+    """Extend an add_indicators() frame with newly fetched bars in O(k).
+
+    `state` is an initially empty dict owned by the caller (one per
+    symbol/interval) and is updated in place. The first call, a config
+    change or a gap in `start` falls back to a full add_indicators() pass;
+    a re-sent last bar (still forming when first seen) replaces it.
+    """
+    win = _indicator_windows(mode, cfg)
+    win_key = (mode, tuple(sorted(win.items())))
+    cols = list(new_bars.columns)
+    if prev_df is None or prev_df.empty or state.get("key") != win_key:
+        raw = new_bars
+        if prev_df is not None and not prev_df.empty:
+            raw = pd.concat([prev_df[cols], new_bars], ignore_index=True)
+            raw = raw.drop_duplicates("start", keep="last")
+        return _full_recompute(raw, state, win_key, win, mode, cfg)
+
+    new = new_bars[new_bars["start"] >= state["start"]]
+    if new.empty:
+        return prev_df
+    vals = state["last"]
+    if new["start"].iat[0] == state["start"]:
+        # The last bar was still forming; rewind it and apply the update
+        vals = state["prev"]
+        if prev_df["start"].iat[-1] == state["start"]:
+            prev_df = prev_df.iloc[:-1]
+        expected = state["start"]
+    else:
+        expected = state["start"] + state["step"]
+    starts = new["start"]
+    gap = (starts.diff().iloc[1:] != state["step"]).any()
+    if starts.iat[0] != expected or gap:
+        raw = pd.concat([prev_df[cols], new_bars], ignore_index=True)
+        raw = raw.drop_duplicates("start", keep="last")
+        return _full_recompute(raw, state, win_key, win, mode, cfg)
+
+    rows = new.reset_index(drop=True).copy()
+    high = rows["high"].to_numpy(dtype=np.float64)
+    low = rows["low"].to_numpy(dtype=np.float64)
+    close = rows["close"].to_numpy(dtype=np.float64)
+    steps = []
+    before = vals
+    for i in range(len(rows)):
+        before, vals = vals, _step_state(vals, win, high[i], low[i], close[i])
+        steps.append(vals)
+    tab = pd.DataFrame(steps)
+    if "ema_slow" in win:
+        rows["ema_fast"] = tab["ema_fast"] if "ema_fast" in win else np.nan
+        rows["ema_slow"] = tab["ema_slow"]
+        gain, loss = tab["avg_gain"], tab["avg_loss"]
+        rows["rsi"] = np.where(loss == 0, 100, 100 - 100 / (1 + gain / loss))
+        if "macd_fast" in win:
+            macd = tab["macd_fast"] - tab["macd_slow"]
+            rows["macd"] = macd
+            rows["macd_signal"] = tab["macd_signal"]
+            rows["macd_hist"] = macd - tab["macd_signal"]
+    rows["atr"] = tab["atr"]
+    rows["atr_frac"] = rows["atr"] / rows["close"]
+    # ret/vol/mom only need a short close tail
+    tail = pd.concat(
+        [prev_df["close"].iloc[-21:], rows["close"]], ignore_index=True
+    )
+    ret = tail.pct_change()
+    k = len(rows)
+    rows["ret"] = ret.iloc[-k:].to_numpy()
+    rows["vol"] = ret.rolling(20).std().iloc[-k:].to_numpy()
+    rows["mom"] = tail.pct_change(10).iloc[-k:].to_numpy()
+
+    state.update(last=vals, prev=before, start=starts.iat[-1])
+    return pd.concat([prev_df, rows], ignore_index=True)
+
+
+def compute_htf_snapshot(
+    df: pd.DataFrame, ema_slow_n: int = 50, rsi_n: int = 14, macd=(12, 26, 9)
+) -> Dict[str, float]:
+    """Last-bar ema_slow/rsi/macd_hist of a higher-TF frame, computing
+    only those three series"""
+    close = df["close"].astype(np.float64)
+    fast, slow, sig = macd
+    line = _ema(close, fast) - _ema(close, slow)
+    hist = line - _ema(line, sig)
+    return {
+        "ema_slow_HTF": float(_ema(close, ema_slow_n).iat[-1]),
+        "rsi_HTF": float(_rsi(close, rsi_n).iat[-1]),
+        "macd_hist_HTF": float(hist.iat[-1]),
+    }
+
+
+_HTF_CACHE: Dict[tuple, tuple] = {}
+_TF_UNIT_SEC = {"m": 60, "h": 3600, "d": 86400}
+
+
+def _tf_seconds(tf: str) -> int:
+    try:
+        return int(tf[:-1]) * _TF_UNIT_SEC[tf[-1]]
+    except (KeyError, ValueError):
+        return 60
+
+
+def _htf_klines(symbol: str, tf: str, testnet: bool) -> pd.DataFrame:
+    """Confirm-TF klines, refetched only once the current TF bar has
+    closed (the snapshot's forming bar may lag by up to one TF bar)"""
+    key = (symbol, tf, bool(testnet))
+    now = time.monotonic()
+    hit = _HTF_CACHE.get(key)
+    if hit is not None and now < hit[0]:
+        return hit[1]
+    d2 = fetch_klines(symbol=symbol, interval=tf, limit=300, testnet=testnet)
+    if not d2.empty:
+        sec = _tf_seconds(tf)
+        _HTF_CACHE[key] = (now + sec - time.time() % sec, d2)
+    return d2
+
+
+def add_mtf_features(
+    df: pd.DataFrame,
+    symbol: str,
+    cfg: dict,
+    testnet: bool,
+    htf_df: pd.DataFrame = None,
+):
+    """Attach the confirm-TF snapshot; pass `htf_df` when it was already
+    fetched alongside the base TF (see fetch_multi_tf)"""
     mtf = cfg.get("mtf", {})
     tf = mtf.get("confirm_tf")
     if not tf:
@@ -157,32 +607,16 @@ def add_mtf_features(df: pd.DataFrame, symbol: str, cfg: dict, testnet: bool):
         # from .logger import get_logger
         #
         # log = get_logger("data_pipeline")  # Unused variable
-        d2 = fetch_klines(symbol=symbol, interval=tf, limit=300, testnet=testnet)
-        if d2.empty:
+        if htf_df is None:
+            htf_df = _htf_klines(symbol, tf, testnet)
+        if htf_df.empty:
             return df
-        d2 = add_indicators(
-            d2,
-            "adaptive",
-            {
-                "indicators": {
-                    "ema": 50,
-                    "rsi": 14,
-                    "macd_fast": 12,
-                    "macd_slow": 26,
-                    "macd_signal": 9,
-                }
-            },
-        )
+        snap = compute_htf_snapshot(htf_df)
         # forward-fill to align last higher-TF snapshot onto low-TF timeline
-        snap = d2.iloc[-1:][["ema_slow", "rsi", "macd_hist"]].rename(
-            columns={
-                "ema_slow": "ema_slow_HTF",
-                "rsi": "rsi_HTF",
-                "macd_hist": "macd_hist_HTF",
-            }
-        )
-        for k, v in snap.iloc[0].items():
-            df[k] = float(v)
+        vals = np.fromiter(snap.values(), dtype=np.float64, count=len(snap))
+        if not np.isnan(vals).any():
+            # one multi-column insert, broadcast over every row
+            df[list(snap)] = vals
     except Exception:
         pass
     return df
@@ -5,10 +5,19 @@ Mengatasi masalah environment variables yang menyebabkan crash saat deployment
 """
 
 import os
+import re
 # import sys  # Unused import
 from pathlib import Path
 from typing import Any, Dict
 
+# KEY=value per line; requiring an identifier start skips comments and
+# blank lines. Only spaces/tabs are trimmed so an empty value never
+# swallows the next line.
+_ENV_RE = re.compile(
+    rb"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$",
+    re.MULTILINE,
+)
+
 
 def load_env_file(env_path: str = ".env") -> Dict[str, str]:
     """Load environment variables from .env file"""
@@ -18,12 +27,11 @@ def load_env_file(env_path: str = ".env") -> Dict[str, str]:
         return env_vars
 
     try:
-        with open(env_path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    env_vars[key.strip()] = value.strip()
+        data = Path(env_path).read_bytes()
+        env_vars = {
+            m.group(1).decode(): m.group(2).decode()
+            for m in _ENV_RE.finditer(data)
+        }
     except Exception as e:
         print(f"Warning: Could not load .env file: {e}")
 
@@ -67,130 +75,122 @@ def get_env_float(key: str, default: float = 0.0) -> float:
         return default
 
 
-def validate_exchange_config() -> Dict[str, Any]:
+_PLACEHOLDERS = frozenset({
+    "your_bybit_api_key_here",
+    "your_bybit_api_secret_here",
+    "your_binance_api_key_here",
+    "your_binance_api_secret_here",
+    "your_openai_api_key_here",
+    "your_telegram_bot_token_here",
+    "your_telegram_user_id_here",
+    "your_twilio_account_sid_here",
+    "your_twilio_auth_token_here",
+    "your_twilio_phone_number_here",
+})
+
+# Keys checked per section; a value that is empty or still a template
+# placeholder counts as unset
+_SPEC = {
+    "bybit": ("BYBIT_API_KEY", "BYBIT_API_SECRET"),
+    "binance": ("BINANCE_API_KEY", "BINANCE_API_SECRET"),
+    "openai": ("OPENAI_API_KEY",),
+    "telegram": ("TELEGRAM_BOT_TOKEN", "TELEGRAM_ADMIN_USER_ID"),
+    "whatsapp": (
+        "TWILIO_ACCOUNT_SID", "TWILIO_AUTH_TOKEN", "TWILIO_PHONE_NUMBER"
+    ),
+}
+
+_TRUTHY = frozenset({"true", "1", "yes", "y", "on"})
+
+_CRITICAL_PATHS = ("logs", "data", "reports", "models")
+
+
+def _unset(env: Dict[str, str], keys) -> list:
+    """Keys from `keys` that are missing or left at a placeholder"""
+    return [k for k in keys if not env.get(k) or env[k] in _PLACEHOLDERS]
+
+
+def _required(env: Dict[str, str], section: str, results: Dict[str, Any]):
+    """Record an error for every unset key of `section`; returns them"""
+    missing = _unset(env, _SPEC[section])
+    for key in missing:
+        results["errors"].append(f"{key} not set or using default value")
+        results["valid"] = False
+    return missing
+
+
+def validate_exchange_config(env: Dict[str, str] = None) -> Dict[str, Any]:
     """Validate exchange configuration"""
+    env = os.environ if env is None else env
     results = {"valid": True, "exchange": None, "errors": [], "warnings": []}
 
     # Get exchange type
-    exchange = get_env_var("EXCHANGE", "bybit")
+    exchange = env.get("EXCHANGE", "bybit")
     results["exchange"] = exchange
 
-    if exchange == "bybit":
-        # Validate Bybit configuration
-        api_key = get_env_var("BYBIT_API_KEY")
-        api_secret = get_env_var("BYBIT_API_SECRET")
-        testnet = get_env_bool("BYBIT_TESTNET", True)
-
-        if not api_key or api_key == "your_bybit_api_key_here":
-            results["errors"].append(
-                "BYBIT_API_KEY not set or using default value"
-            )
-            results["valid"] = False
-
-        if not api_secret or api_secret == "your_bybit_api_secret_here":
-            results["errors"].append(
-                "BYBIT_API_SECRET not set or using default value"
-            )
-            results["valid"] = False
-
-        results["bybit_testnet"] = testnet
-
-    elif exchange == "binance":
-        # Validate Binance configuration
-        api_key = get_env_var("BINANCE_API_KEY")
-        api_secret = get_env_var("BINANCE_API_SECRET")
-        testnet = get_env_bool("BINANCE_TESTNET", True)
-
-        if not api_key or api_key == "your_binance_api_key_here":
-            results["errors"].append("BINANCE_API_KEY not set or using default value")
-            results["valid"] = False
-
-        if not api_secret or api_secret == "your_binance_api_secret_here":
-            results["errors"].append(
-                "BINANCE_API_SECRET not set or using default value"
-            )
-            results["valid"] = False
-
-        results["binance_testnet"] = testnet
+    if exchange in ("bybit", "binance"):
+        _required(env, exchange, results)
+        testnet_key = f"{exchange.upper()}_TESTNET"
+        results[f"{exchange}_testnet"] = (
+            env.get(testnet_key, "True").lower() in _TRUTHY
+        )
 
     return results
 
 
-def validate_openai_config() -> Dict[str, Any]:
+def validate_openai_config(env: Dict[str, str] = None) -> Dict[str, Any]:
     """Validate OpenAI configuration"""
+    env = os.environ if env is None else env
     results = {"valid": True, "errors": [], "warnings": []}
 
-    api_key = get_env_var("OPENAI_API_KEY")
-
-    if not api_key or api_key == "your_openai_api_key_here":
-        results["errors"].append("OPENAI_API_KEY not set or using default value")
-        results["valid"] = False
-    else:
-        # Basic validation - check if it starts with 'sk-'
-        if not api_key.startswith("sk-"):
-            results["warnings"].append("OPENAI_API_KEY format may be incorrect")
+    _required(env, "openai", results)
+    # Basic validation - check if it starts with 'sk-'
+    if results["valid"] and not env["OPENAI_API_KEY"].startswith("sk-"):
+        results["warnings"].append("OPENAI_API_KEY format may be incorrect")
 
     return results
 
 
-def validate_telegram_config() -> Dict[str, Any]:
+def validate_telegram_config(env: Dict[str, str] = None) -> Dict[str, Any]:
     """Validate Telegram configuration"""
+    env = os.environ if env is None else env
     results = {"valid": True, "errors": [], "warnings": []}
 
-    bot_token = get_env_var("TELEGRAM_BOT_TOKEN")
-    admin_user_id = get_env_var("TELEGRAM_ADMIN_USER_ID")
-
-    if not bot_token or bot_token == "your_telegram_bot_token_here":
-        results["errors"].append("TELEGRAM_BOT_TOKEN not set or using default value")
-        results["valid"] = False
-
-    if not admin_user_id or admin_user_id == "your_telegram_user_id_here":
-        results["errors"].append(
-            "TELEGRAM_ADMIN_USER_ID not set or using default value"
-        )
-        results["valid"] = False
-    else:
+    missing = _required(env, "telegram", results)
+    if "TELEGRAM_ADMIN_USER_ID" not in missing:
         # Validate user ID is numeric
         try:
-            int(admin_user_id)
+            int(env["TELEGRAM_ADMIN_USER_ID"])
         except ValueError:
             results["warnings"].append("TELEGRAM_ADMIN_USER_ID should be numeric")
 
     return results
 
 
-def validate_whatsapp_config() -> Dict[str, Any]:
+def validate_whatsapp_config(env: Dict[str, str] = None) -> Dict[str, Any]:
     """Validate WhatsApp/Twilio configuration (optional)"""
+    env = os.environ if env is None else env
     results = {"valid": True, "errors": [], "warnings": [], "optional": True}
 
-    account_sid = get_env_var("TWILIO_ACCOUNT_SID")
-    auth_token = get_env_var("TWILIO_AUTH_TOKEN")
-    phone_number = get_env_var("TWILIO_PHONE_NUMBER")
-
-    if not account_sid or account_sid == "your_twilio_account_sid_here":
-        results["warnings"].append("TWILIO_ACCOUNT_SID not set (optional)")
-
-    if not auth_token or auth_token == "your_twilio_auth_token_here":
-        results["warnings"].append("TWILIO_AUTH_TOKEN not set (optional)")
-
-    if not phone_number or phone_number == "your_twilio_phone_number_here":
-        results["warnings"].append("TWILIO_PHONE_NUMBER not set (optional)")
+    for key in _unset(env, _SPEC["whatsapp"]):
+        results["warnings"].append(f"{key} not set (optional)")
 
     return results
 
 
 def validate_all_env() -> Dict[str, Any]:
-    """Validate all environment variables"""
+    """Validate all environment variables against one os.environ snapshot"""
+    env = dict(os.environ)
     results = {
         "overall_valid": True,
-        "exchange": validate_exchange_config(),
-        "openai": validate_openai_config(),
-        "telegram": validate_telegram_config(),
-        "whatsapp": validate_whatsapp_config(),
+        "exchange": validate_exchange_config(env),
+        "openai": validate_openai_config(env),
+        "telegram": validate_telegram_config(env),
+        "whatsapp": validate_whatsapp_config(env),
         "system": {
-            "pythonpath": get_env_var("PYTHONPATH", "/app"),
-            "timezone": get_env_var("TZ", "Asia/Jakarta"),
-            "log_level": get_env_var("LOG_LEVEL", "INFO"),
+            "pythonpath": env.get("PYTHONPATH", "/app"),
+            "timezone": env.get("TZ", "Asia/Jakarta"),
+            "log_level": env.get("LOG_LEVEL", "INFO"),
         },
     }
 
@@ -280,11 +280,11 @@ def fix_env_issues() -> Dict[str, Any]:
                 os.environ[key] = default_value
                 fixes_applied.append(f"set_default_{key.lower()}")
 
-        # Fix 4: Ensure critical paths exist
-        critical_paths = ["logs", "data", "reports", "models"]
-        for path in critical_paths:
-            Path(path).mkdir(exist_ok=True)
-            fixes_applied.append(f"created_dir_{path}")
+        # Fix 4: Ensure critical paths exist (only missing ones are created)
+        for path in _CRITICAL_PATHS:
+            if not os.path.isdir(path):
+                os.makedirs(path, exist_ok=True)
+                fixes_applied.append(f"created_dir_{path}")
 
         return {
             "success": True,
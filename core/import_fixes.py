@@ -4,10 +4,32 @@ Import fixes and fallback mechanisms for core modules
 Mengatasi masalah import yang menyebabkan crash saat deployment
 """
 
+import importlib
+import json
+import logging
 import sys
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Set
+
+try:
+    import orjson
+except Exception:
+    orjson = None  # fallback to stdlib json
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(obj, indent=2).encode("utf-8")
 
 # Add current directory to Python path
 if "." not in sys.path:
@@ -15,9 +37,13 @@ if "." not in sys.path:
 
 
 def safe_import(module_name: str, fallback=None):
-    """Safely import a module with fallback"""
+    """Safely import a module with fallback (returns the named submodule
+    for dotted names)"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
     try:
-        return __import__(module_name)
+        return importlib.import_module(module_name)
     except ImportError as e:
         print(f"Warning: Could not import {module_name}: {e}")
         return fallback
@@ -40,22 +66,30 @@ def safe_call(func, *args, **kwargs):
         return None
 
 
+# Fallback loggers live under "fallback.*" with their own stdout handler,
+# so they print even when root logging was never configured
+_FALLBACK_ROOT = logging.getLogger("fallback")
+if not _FALLBACK_ROOT.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(
+        logging.Formatter("[%(levelname)s] %(name)s: %(message)s")
+    )
+    _FALLBACK_ROOT.addHandler(_handler)
+    _FALLBACK_ROOT.setLevel(
+        getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
+    )
+    _FALLBACK_ROOT.propagate = False
+
+
 # Fallback logger
 class FallbackLogger:
     def __init__(self, name):
         self.name = name
-
-    def info(self, msg):
-        print(f"[INFO] {self.name}: {msg}")
-
-    def warning(self, msg):
-        print(f"[WARNING] {self.name}: {msg}")
-
-    def error(self, msg):
-        print(f"[ERROR] {self.name}: {msg}")
-
-    def debug(self, msg):
-        print(f"[DEBUG] {self.name}: {msg}")
+        self._log = logging.getLogger("fallback." + name)
+        self.info = self._log.info
+        self.warning = self._log.warning
+        self.error = self._log.error
+        self.debug = self._log.debug
 
 
 def get_logger(name: str):
@@ -71,10 +105,8 @@ def get_logger(name: str):
 def load_json(path: str, default: Any = None) -> Any:
     """Load JSON with fallback"""
     try:
-        import json
-
-        with open(path, "r") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return _loads(f.read())
     except Exception:
         return default
 
@@ -82,23 +114,34 @@ def load_json(path: str, default: Any = None) -> Any:
 def save_json(path: str, obj: Any) -> bool:
     """Save JSON with error handling"""
     try:
-        import json
-
         Path(path).parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(obj, f, indent=2)
+        with open(path, "wb") as f:
+            f.write(_dumps(obj))
         return True
     except Exception as e:
         print(f"Warning: Could not save JSON to {path}: {e}")
         return False
 
 
+_CONFIG_FNS: Dict[str, Any] = {}
+
+
+def _config_fn(name: str):
+    """core.config_manager.<name>, resolved once and then reused"""
+    fn = _CONFIG_FNS.get(name)
+    if fn is None:
+        try:
+            fn = getattr(importlib.import_module("core.config_manager"), name)
+        except AttributeError as e:
+            raise ImportError(str(e)) from e
+        _CONFIG_FNS[name] = fn
+    return fn
+
+
 def get_exchange() -> str:
     """Get exchange with fallback"""
     try:
-        from core.config_manager import get_exchange as _get_exchange
-
-        return _get_exchange()
+        return _config_fn("get_exchange")()
     except ImportError:
         # Fallback to environment variable or default
         return os.getenv("EXCHANGE", "bybit")
@@ -107,11 +150,7 @@ def get_exchange() -> str:
 def get_binance_testnet() -> bool:
     """Get Binance testnet setting with fallback"""
     try:
-        from core.config_manager import (
-            get_binance_testnet as _get_binance_testnet
-        )
-
-        return _get_binance_testnet()
+        return _config_fn("get_binance_testnet")()
     except ImportError:
         # Fallback to environment variable or default
         return os.getenv("BINANCE_TESTNET", "true").lower() in (
@@ -162,6 +201,15 @@ def get_system_info() -> Dict[str, Any]:
         return {"cpu_percent": 0, "memory_percent": 0, "disk_percent": 0}
 
 
+def config_dir_entries(config_dir: str = "config") -> Set[str]:
+    """Names of the files in config_dir, from one directory read"""
+    try:
+        with os.scandir(config_dir) as it:
+            return {e.name for e in it if e.is_file()}
+    except OSError:
+        return set()
+
+
 def validate_config_files() -> Dict[str, Any]:
     """Validate configuration files with fallback"""
     required_configs = [
@@ -172,13 +220,15 @@ def validate_config_files() -> Dict[str, Any]:
 
     results = {"valid": True, "missing": [], "errors": []}
 
+    present = config_dir_entries()
     for config_path in required_configs:
-        if not Path(config_path).exists():
+        if os.path.basename(config_path) not in present:
             results["missing"].append(config_path)
             results["valid"] = False
         else:
             try:
-                load_json(config_path)
+                with open(config_path, "rb") as f:
+                    _loads(f.read())
             except Exception as e:
                 results["errors"].append(f"{config_path}: {e}")
                 results["valid"] = False
@@ -186,6 +236,24 @@ def validate_config_files() -> Dict[str, Any]:
     return results
 
 
+# Substrings of a python command line that mark a bot process
+_PROCESS_KEYWORDS = ("run.py", "kang_bot", "streamlit")
+
+
+def short_cmdline(parts, limit: int = 100) -> str:
+    """Space-joined parts cut to `limit` chars (+ "..."), joining only
+    the leading parts that can show up in the result"""
+    out = []
+    n = -1
+    for p in parts:
+        out.append(p)
+        n += len(p) + 1
+        if n > limit:
+            break
+    s = " ".join(out)
+    return s[:limit] + "..." if len(s) > limit else s
+
+
 def get_process_info() -> Dict[str, Any]:
     """Get process information with fallback"""
     try:
@@ -195,20 +263,19 @@ def get_process_info() -> Dict[str, Any]:
         for proc in psutil.process_iter(["pid", "name", "cmdline"]):
             try:
                 if "python" in proc.info["name"].lower():
-                    cmdline = " ".join(proc.info["cmdline"])
+                    parts = proc.info["cmdline"]
+                    # Keywords contain no spaces, so matching per argument
+                    # equals matching the joined command line
                     if any(
-                        keyword in cmdline
-                        for keyword in ["run.py", "kang_bot", "streamlit"]
+                        keyword in part
+                        for part in parts
+                        for keyword in _PROCESS_KEYWORDS
                     ):
                         processes.append(
                             {
                                 "pid": proc.info["pid"],
                                 "name": proc.info["name"],
-                                "cmdline": (
-                                    cmdline[:100] + "..."
-                                    if len(cmdline) > 100
-                                    else cmdline
-                                ),
+                                "cmdline": short_cmdline(parts),
                             }
                         )
             except Exception:
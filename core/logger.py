@@ -2,11 +2,21 @@ import logging
 import os
 # import pathlib  # Unused import
 
+_CONFIGURED = False
 
-def get_logger(name: str) -> logging.Logger:
+
+def _configure() -> None:
+    """Root logging setup, done on the first get_logger() call only"""
+    global _CONFIGURED
     level = os.getenv("LOG_LEVEL", "INFO").upper()
     logging.basicConfig(
         format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
         level=getattr(logging, level, logging.INFO),
     )
+    _CONFIGURED = True
+
+
+def get_logger(name: str) -> logging.Logger:
+    if not _CONFIGURED:
+        _configure()
     return logging.getLogger(name)
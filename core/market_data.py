@@ -1,6 +1,9 @@
 import requests
 import time
+from functools import lru_cache
 from typing import Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .config_manager import get_exchange
 
 try:
@@ -11,6 +14,22 @@ except Exception:
     llm_context_score = None  # type: ignore
 
 
+@lru_cache(maxsize=1)
+def _session() -> requests.Session:
+    """Keep-alive pool shared by the orderbook requests"""
+    session = requests.Session()
+    session.headers.update({"User-Agent": "kang_bot/1.0"})
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        ),
+    )
+    return session
+
+
 def bybit_base(testnet: bool) -> str:
     return (
         "https://api-testnet.bybit.com" if testnet else "https://api.bybit.com"
@@ -37,7 +56,7 @@ def get_orderbook(
                 if bool(testnet)
                 else "https://fapi.binance.com"
             )
-            resp = requests.get(
+            resp = _session().get(
                 f"{base}/fapi/v1/depth",
                 params={"symbol": symbol, "limit": min(limit, 1000)},
                 timeout=timeout,
@@ -58,7 +77,7 @@ def get_orderbook(
     # default: bybit
     url = f"{bybit_base(testnet)}/v5/market/orderbook"
     params = {"category": category, "symbol": symbol, "limit": limit}
-    r = requests.get(url, params=params, timeout=timeout)
+    r = _session().get(url, params=params, timeout=timeout)
     r.raise_for_status()
     j = r.json()
     if j.get("retCode") != 0:
@@ -1,4 +1,9 @@
+import atexit
 import os
+import queue
+import threading
+import time
+from functools import lru_cache
 # import json  # Unused import
 
 # Safe imports with fallbacks - PERBAIKAN DEPLOYMENT
@@ -16,11 +21,96 @@ TELEGRAM_CHAT_ID = (
 )
 
 
+@lru_cache(maxsize=1)
+def _session():
+    """Keep-alive session for api.telegram.org (one TLS handshake)"""
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.headers.update({"User-Agent": "kang_bot/1.0"})
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        ),
+    )
+    return session
+
+
+def _post(url: str, **kwargs):
+    """POST to the Bot API; on 429 waits out retry_after once and retries
+    (Telegram flood control)"""
+    r = _session().post(url, **kwargs)
+    if r.status_code == 429:
+        try:
+            wait = float(r.json()["parameters"]["retry_after"])
+        except Exception:
+            wait = 1.0
+        print(f"[notifier] Telegram flood control, retrying in {wait:.0f}s")
+        time.sleep(min(wait, 60.0))
+        r = _session().post(url, **kwargs)
+    return r
+
+
+# Sends run on one background thread, in order, so callers (trading loop,
+# scheduler) never block on Telegram; flush() drains it at exit
+_TG_QUEUE: "queue.Queue" = queue.Queue()
+_TG_LOCK = threading.Lock()
+_TG_THREAD = None
+
+
+def _tg_worker():
+    while True:
+        fn, args, kwargs = _TG_QUEUE.get()
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            print("[notifier] queued send failed:", e)
+        finally:
+            _TG_QUEUE.task_done()
+
+
+def _enqueue(fn, *args, **kwargs) -> bool:
+    global _TG_THREAD
+    with _TG_LOCK:
+        if _TG_THREAD is None or not _TG_THREAD.is_alive():
+            _TG_THREAD = threading.Thread(
+                target=_tg_worker, name="telegram-sender", daemon=True
+            )
+            _TG_THREAD.start()
+    _TG_QUEUE.put((fn, args, kwargs))
+    return True
+
+
+def flush(timeout: float = 10.0) -> bool:
+    """Wait up to `timeout` seconds for queued sends; True if drained"""
+    deadline = time.monotonic() + timeout
+    with _TG_QUEUE.all_tasks_done:
+        while _TG_QUEUE.unfinished_tasks:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return False
+            _TG_QUEUE.all_tasks_done.wait(left)
+    return True
+
+
+atexit.register(flush)
+
+
 def send_telegram_message(text: str) -> bool:
-    """Send a Telegram message using Bot API - ENHANCED FOR DEPLOYMENT.
+    """Queue a Telegram message using Bot API - ENHANCED FOR DEPLOYMENT.
     Requires TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID in environment.
-    Returns True on success, False otherwise.
+    Returns True once queued, False if it cannot be sent at all.
     """
+    if requests is None or not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
+        return _send_telegram_message(text)  # reports why, returns False
+    return _enqueue(_send_telegram_message, text)
+
+
+def _send_telegram_message(text: str) -> bool:
     if requests is None:
         print("[notifier] requests library not available")
         return False
@@ -37,7 +127,7 @@ def send_telegram_message(text: str) -> bool:
         url = f"https://api.telegram.org/bot{token}/sendMessage"
         payload = {"chat_id": chat_id, "text": str(text)}
 
-        r = requests.post(url, json=payload, timeout=10)
+        r = _post(url, json=payload, timeout=10)
         if r.status_code == 200:
             return True
         print("[notifier] Telegram API error:", r.status_code, r.text[:200])
@@ -54,13 +144,21 @@ def _bot_creds():
 
 
 def telegram_send_direct(text: str) -> bool:
-    """Alias helper used across the project to send plain text to Telegram."""
+    """Alias helper used across the project to send plain text to Telegram
+    (queued; see send_telegram_message)."""
+    token, chat_id = _bot_creds()
+    if not token or not chat_id:
+        return _telegram_send_direct(text)
+    return _enqueue(_telegram_send_direct, text)
+
+
+def _telegram_send_direct(text: str) -> bool:
     token, chat_id = _bot_creds()
     if not token or not chat_id:
         print("[notifier] Missing TELEGRAM_BOT_TOKEN/TELEGRAM_CHAT_ID")
         return False
     try:
-        r = requests.post(
+        r = _post(
             f"https://api.telegram.org/bot{token}/sendMessage",
             json={"chat_id": chat_id, "text": str(text)},
             timeout=10,
@@ -79,7 +177,15 @@ def telegram_send_direct(text: str) -> bool:
 
 
 def telegram_send_photo_direct(photo: str, caption: str | None = None) -> bool:
-    """Send a photo to Telegram (photo can be a URL or local file path)."""
+    """Send a photo to Telegram (photo can be a URL or local file path);
+    queued behind earlier messages so the order is kept."""
+    token, chat_id = _bot_creds()
+    if not token or not chat_id:
+        return _telegram_send_photo_direct(photo, caption)
+    return _enqueue(_telegram_send_photo_direct, photo, caption)
+
+
+def _telegram_send_photo_direct(photo: str, caption: str | None = None) -> bool:
     token, chat_id = _bot_creds()
     if not token or not chat_id:
         print("[notifier] Missing TELEGRAM_BOT_TOKEN/TELEGRAM_CHAT_ID")
@@ -87,17 +193,18 @@ def telegram_send_photo_direct(photo: str, caption: str | None = None) -> bool:
     url = f"https://api.telegram.org/bot{token}/sendPhoto"
     try:
         if os.path.exists(photo):
+            # Read up front so a flood-control retry can resend the bytes
             with open(photo, "rb") as f:
-                files = {"photo": f}
-                data = {"chat_id": chat_id}
-                if caption:
-                    data["caption"] = caption
-                r = requests.post(url, data=data, files=files, timeout=20)
+                files = {"photo": (os.path.basename(photo), f.read())}
+            data = {"chat_id": chat_id}
+            if caption:
+                data["caption"] = caption
+            r = _post(url, data=data, files=files, timeout=20)
         else:
             payload = {"chat_id": chat_id, "photo": photo}
             if caption:
                 payload["caption"] = caption
-            r = requests.post(url, json=payload, timeout=20)
+            r = _post(url, json=payload, timeout=20)
         ok = r.status_code == 200
         if not ok:
             print(
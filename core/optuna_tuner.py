@@ -7,7 +7,11 @@ Public API:
     symbol:str|None=None, testnet:bool|None=None) -> dict
 
 Highlights:
-- Deterministic TPE sampler (seed=42) + MedianPruner
+- Seeded TPE sampler (seed=42) + MedianPruner; trials run on
+  OPTUNA_JOBS threads (default / <=0: all cores), deterministic only with
+  OPTUNA_JOBS=1
+- OPTUNA_STORAGE_SQLITE=1 keeps the study in data/optuna_{mode}.db so
+  an interrupted tune resumes where it stopped
 - Walk-forward evaluation (train/valid split) on recent klines
 - Objective = risk-adjusted return (return * sharpe_like) with penalties
 - Transaction cost modeled via fee_bps
@@ -15,7 +19,7 @@ Highlights:
 - Persist best params to config/{mode}_best.json (merged with existing)
 
 Dependencies:
-- Relies on core.data_pipeline.fetch_klines, add_indicators
+- Relies on core.data_pipeline.fetch_klines
 - Does not place orders; pure backtest scoring
 """
 from __future__ import annotations
@@ -45,7 +49,8 @@ except Exception:
         return ["BTCUSDT"]
 
 
-from .data_pipeline import fetch_klines, add_indicators
+from .data_pipeline import fetch_klines
+from ._njit import NUMBA_AVAILABLE, njit
 
 log = get_logger("optuna_tuner")
 
@@ -79,6 +84,81 @@ def _train_valid_split(
     return df.iloc[:cut].copy(), df.iloc[cut:].copy()
 
 
+@njit(fastmath=False, nogil=True)
+def _ewm(x, com):
+    """pandas ``ewm(com=com, adjust=False).mean()`` in one pass, same
+    recurrence (and NaN handling) as its Cython kernel"""
+    n = x.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+    alpha = 1.0 / (1.0 + com)
+    old_wt_factor = 1.0 - alpha
+    old_wt = 1.0
+    weighted = x[0]
+    out[0] = weighted
+    for i in range(1, n):
+        cur = x[i]
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if cur == cur:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (
+                        old_wt + alpha
+                    )
+                old_wt = 1.0
+        elif cur == cur:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+# fastmath is off so the TP/SL comparisons see the same rounding as the
+# plain-Python loop did (identical trade lists). nogil lets parallel
+# Optuna trials (threads) run the kernels side by side.
+@njit(fastmath=False, nogil=True)
+def _simulate(close, high, low, entry_edge, exit_sig, tp, sl, fee):
+    """Long-only TP/SL state machine; returns the per-trade PnL array"""
+    pnl = np.empty(close.shape[0])
+    k = 0
+    in_pos = False
+    pos_entry = take = stop = 0.0
+    for i in range(1, close.shape[0]):
+        if not in_pos:
+            if entry_edge[i]:
+                pos_entry = close[i] * (1 + fee)  # buy with fee
+                take = pos_entry * (1 + tp)
+                stop = pos_entry * (1 - sl)
+                in_pos = True
+            continue
+        if low[i] <= stop:
+            exit_price = stop * (1 - fee)
+        elif high[i] >= take:
+            exit_price = take * (1 - fee)
+        elif exit_sig[i]:
+            exit_price = close[i] * (1 - fee)
+        else:
+            continue
+        pnl[k] = (exit_price - pos_entry) / pos_entry
+        k += 1
+        in_pos = False
+
+    # Close at last bar if open
+    if in_pos:
+        pnl[k] = (close[-1] * (1 - fee) - pos_entry) / pos_entry
+        k += 1
+    return pnl[:k]
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load the cached build) now rather than in the first trial
+    _ewm(np.ones(2), 1.0)
+    _simulate(
+        np.ones(2), np.ones(2), np.ones(2), np.zeros(2, dtype=np.bool_),
+        np.zeros(2, dtype=np.bool_), 0.01, 0.01, 0.0,
+    )
+
+
 def _apply_strategy(df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
     """Generate signals and simulate PnL with TP/SL and simple fee model."""
     ema_f, ema_s = int(params["ema_fast"]), int(params["ema_slow"])
@@ -91,57 +171,39 @@ def _apply_strategy(df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
     fee_bps = float(params.get("fee_bps", 3.0))  # 0.03% each side default
     # price/ohlc columns expected: open, high, low, close, volume, ts
     df = df.copy()
-    # Indicators
-    df["ema_f"] = df["close"].ewm(span=ema_f, adjust=False).mean()
-    df["ema_s"] = df["close"].ewm(span=ema_s, adjust=False).mean()
-    # RSI
-    delta = df["close"].diff()
-    up, down = delta.clip(lower=0), -delta.clip(upper=0)
-    roll_up = up.ewm(alpha=1 / rsi_p, adjust=False).mean()
-    roll_down = down.ewm(alpha=1 / rsi_p, adjust=False).mean().replace(0, 1e-9)
-    rs = roll_up / roll_down
-    df["rsi"] = 100 - (100 / (1 + rs))
+    raw = df["close"].to_numpy()
+    close = raw.astype(float)
+    # Indicators; centres of mass derived from span/alpha exactly as pandas
+    # does, so the EWMAs match Series.ewm bit for bit
+    ema_fast = _ewm(close, (ema_f - 1) / 2)
+    ema_slow = _ewm(close, (ema_s - 1) / 2)
+    # RSI (delta taken in the column's own dtype, as Series.diff does)
+    delta = np.full(len(raw), np.nan)
+    delta[1:] = np.diff(raw)
+    com = (1 - 1 / rsi_p) / (1 / rsi_p)
+    roll_up = _ewm(np.maximum(delta, 0.0), com)
+    roll_down = _ewm(-np.minimum(delta, 0.0), com)
+    roll_down[roll_down == 0] = 1e-9
+    rsi = 100 - (100 / (1 + roll_up / roll_down))
 
     # Entry rule: EMA cross up & RSI > rsi_buy (long-only for safety here)
-    df["long_signal"] = (df["ema_f"] > df["ema_s"]) & (df["rsi"] > rsi_b)
+    ls = (ema_fast > ema_slow) & (rsi > rsi_b)
     # Exit rule: take-profit/stop-loss or EMA cross down / RSI < rsi_sell
-    df["exit_signal"] = (df["ema_f"] < df["ema_s"]) | (df["rsi"] < rsi_s)
+    exit_sig = (ema_fast < ema_slow) | (rsi < rsi_s)
+    df["ema_f"], df["ema_s"], df["rsi"] = ema_fast, ema_slow, rsi
+    df["long_signal"], df["exit_signal"] = ls, exit_sig
+
+    # Simulate sequential trades over plain arrays (no per-bar iloc)
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    # Entries fire on the bar where long_signal switches on
+    entry_edge = ls & ~np.roll(ls, 1)
+    if len(entry_edge):
+        entry_edge[0] = False
 
-    # Simulate sequential trades
-    pos_entry = None
-    entries, exits, pnl_list = [], [], []
     fee = fee_bps / 10000.0
-    for i in range(1, len(df)):
-        row = df.iloc[i]
-        prev = df.iloc[i - 1]
-        price = float(row["close"])
-        if pos_entry is None:
-            if row["long_signal"] and not prev["long_signal"]:
-                pos_entry = price * (1 + fee)  # buy with fee
-                entries.append((row.get("ts", i), pos_entry))
-        else:
-            take = pos_entry * (1 + tp)
-            stop = pos_entry * (1 - sl)
-            hi, lo = float(row["high"]), float(row["low"])
-            exit_price = None
-            if lo <= stop:
-                exit_price = stop * (1 - fee)
-            elif hi >= take:
-                exit_price = take * (1 - fee)
-            elif row["exit_signal"]:
-                exit_price = price * (1 - fee)
-            if exit_price is not None:
-                pnl = (exit_price - pos_entry) / pos_entry
-                exits.append((row.get("ts", i), exit_price))
-                pnl_list.append(pnl)
-                pos_entry = None
-
-    # Close at last bar if open
-    if pos_entry is not None:
-        last = float(df.iloc[-1]["close"]) * (1 - fee)
-        pnl_list.append((last - pos_entry) / pos_entry)
-
-    df.attrs["pnl_list"] = pnl_list
+    pnls = _simulate(close, high, low, entry_edge, exit_sig, tp, sl, fee)
+    df.attrs["pnl_list"] = pnls.tolist()
     return df
 
 
@@ -179,9 +241,7 @@ def _score_pnl(pnls: List[float]) -> Dict[str, float]:
 # ------------------------ Optuna Objective ------------------------
 
 
-def _objective(
-    trial: "optuna.Trial", mode: str, symbol: str, timeframe: str, testnet: bool
-) -> float:
+def _objective(trial: "optuna.Trial", valid: pd.DataFrame) -> float:
     # Search space
     ema_fast = trial.suggest_int("ema_fast", 5, 20)
     ema_slow = trial.suggest_int("ema_slow", max(ema_fast + 5, 25), 100)
@@ -202,23 +262,7 @@ def _objective(
         fee_bps=fee_bps,
     )
 
-    # Data
-    try:
-        df = fetch_klines(
-            symbol=symbol, timeframe=timeframe, limit=2000, testnet=testnet
-        )
-    except Exception as e:
-        raise optuna.TrialPruned(f"Failed to fetch klines: {e}")
-    if df is None or len(df) < 300:
-        raise optuna.TrialPruned("Not enough data")
-
-    # Indicators and split
-    df = add_indicators(df) if hasattr(df, "pipe") else df
-    train, valid = _train_valid_split(df, valid_frac=0.3)
-    # Train-only warmup
-    _ = _apply_strategy(train, params)
-
-    # Valid evaluation
+    # Valid evaluation (data is fetched and split once per study)
     valid = _apply_strategy(valid, params)
     metrics = _score_pnl(valid.attrs.get("pnl_list", []))
 
@@ -230,6 +274,18 @@ def _objective(
     return float(metrics["score"])
 
 
+def _load_valid(symbol: str, timeframe: str, testnet: bool) -> pd.DataFrame:
+    """Recent klines for the study, minus the train part of the split"""
+    try:
+        df = fetch_klines(symbol, timeframe, limit=2000, testnet=testnet)
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch klines: {e}") from e
+    if df is None or len(df) < 300:
+        raise RuntimeError("Not enough data")
+    _, valid = _train_valid_split(df, valid_frac=0.3)
+    return valid
+
+
 # ------------------------ Public API ------------------------
 
 
@@ -256,18 +312,30 @@ def tune_and_train(
         testnet,
     )
 
+    # Same data for every trial; only the hyperparameters vary
+    valid = _load_valid(symbol, timeframe, testnet)
+
     sampler = optuna.samplers.TPESampler(seed=42)
     pruner = optuna.pruners.MedianPruner(n_warmup_steps=10)
+    storage = None
+    if _env_bool("OPTUNA_STORAGE_SQLITE", False):
+        os.makedirs("data", exist_ok=True)
+        storage = f"sqlite:///data/optuna_{mode}.db"
     study = optuna.create_study(
         direction="maximize",
         sampler=sampler,
         pruner=pruner,
         study_name=f"tune_{mode}_{symbol}_{timeframe}",
+        storage=storage,
+        load_if_exists=storage is not None,
     )
+    n_jobs = int(os.getenv("OPTUNA_JOBS", "-1"))
+    if n_jobs <= 0:  # -1 (Optuna's "all cores") or 0
+        n_jobs = os.cpu_count() or 2
     study.optimize(
-        lambda tr: _objective(tr, mode, symbol, timeframe, testnet),
+        lambda tr: _objective(tr, valid),
         n_trials=int(n_trials),
-        n_jobs=1,
+        n_jobs=n_jobs,
         show_progress_bar=False,
     )
 
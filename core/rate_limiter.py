@@ -2,52 +2,102 @@
 Rate limiting utilities for API calls
 """
 
+import os
 import time
+from collections import deque
 # from typing import Dict, Optional  # Unused imports
 from threading import Lock
 
 
 class RateLimiter:
-    """Simple rate limiter for API calls"""
+    """Simple rate limiter for API calls (sliding window)"""
 
     def __init__(self, max_calls: int, time_window: float):
         self.max_calls = max_calls
         self.time_window = time_window
-        self.calls = []
+        # Monotonic timestamps, appended in order: the head is the oldest
+        self.calls = deque()
         self.lock = Lock()
 
+    def _expire(self, now: float):
+        calls = self.calls
+        while calls and now - calls[0] >= self.time_window:
+            calls.popleft()
+
     def can_call(self) -> bool:
         """Check if we can make a call now"""
         with self.lock:
-            now = time.time()
-            # Remove old calls outside time window
-            self.calls = [
-                call_time
-                for call_time in self.calls
-                if now - call_time < self.time_window
-            ]
-
+            self._expire(time.monotonic())
             return len(self.calls) < self.max_calls
 
     def record_call(self):
         """Record a call"""
         with self.lock:
-            self.calls.append(time.time())
+            self.calls.append(time.monotonic())
+
+    def wait_if_needed(self):
+        """Wait if rate limit is exceeded"""
+        with self.lock:
+            now = time.monotonic()
+            self._expire(now)
+            if len(self.calls) < self.max_calls:
+                return
+            wait_time = self.time_window - (now - self.calls[0])
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+class TokenBucketLimiter:
+    """Token-bucket variant of RateLimiter (same interface): max_calls
+    tokens refilled evenly over time_window, no per-call allocation"""
+
+    def __init__(self, max_calls: int, time_window: float):
+        self.max_calls = max_calls
+        self.time_window = time_window
+        self.rate = max_calls / time_window
+        self.tokens = float(max_calls)
+        self.last = time.monotonic()
+        self.lock = Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(
+            self.max_calls, self.tokens + (now - self.last) * self.rate
+        )
+        self.last = now
+
+    def can_call(self) -> bool:
+        """Check if we can make a call now"""
+        with self.lock:
+            self._refill(time.monotonic())
+            return self.tokens >= 1.0
+
+    def record_call(self):
+        """Record a call"""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1.0
 
     def wait_if_needed(self):
         """Wait if rate limit is exceeded"""
-        if not self.can_call():
-            # Calculate wait time
-            oldest_call = min(self.calls)
-            wait_time = self.time_window - (time.time() - oldest_call)
-            if wait_time > 0:
-                time.sleep(wait_time)
+        with self.lock:
+            self._refill(time.monotonic())
+            wait_time = (1.0 - self.tokens) / self.rate
+        if wait_time > 0:
+            time.sleep(wait_time)
+
 
+# RATE_LIMIT_TOKEN_BUCKET=1 switches the global limiters to token buckets
+_Limiter = (
+    TokenBucketLimiter
+    if os.getenv("RATE_LIMIT_TOKEN_BUCKET", "").strip().lower()
+    in ("1", "true", "yes", "on")
+    else RateLimiter
+)
 
 # Global rate limiters
-openai_limiter = RateLimiter(
+openai_limiter = _Limiter(
     max_calls=60, time_window=60.0
 )  # 60 calls per minute
-bybit_limiter = RateLimiter(
+bybit_limiter = _Limiter(
     max_calls=120, time_window=60.0
 )  # 120 calls per minute
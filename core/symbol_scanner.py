@@ -123,27 +123,31 @@ def _llm_rerank(
     if not enable:
         return scored
     try:
-        from core.ai_signal import llm_pair_score
+        from core.ai_signal import batch_pair_scores
     except Exception as e:
         log.warning("LLM rerank unavailable: %s", e)
         return scored
     wq = float(weights.get("w_quant", 0.75))
     wl = float(weights.get("w_llm", 0.25))
     top_syms = [s for _, s in scored[: min(len(scored), 20)]]
-    merged = []
+    snaps = {}
     for sym in top_syms:
         rec = next((r for r in rows if r.get("symbol") == sym), {})
-        snap = {
+        snaps[sym] = {
             "ret24h": abs(float(rec.get("price24hPcnt", 0.0))) / 100.0,
             "atr": 0.0,
             "eff": 0.0,
             "spread_bps": 0.0,
             "funding": float(rec.get("fundingRate", 0.0)),
         }
-        try:
-            llm_score = float(llm_pair_score(sym, snap))
-        except Exception:
-            llm_score = 0.0
+    try:
+        llm_scores = batch_pair_scores(top_syms, snaps)
+    except Exception as e:
+        log.warning("LLM batch scoring failed: %s", e)
+        llm_scores = {}
+    merged = []
+    for sym in top_syms:
+        llm_score = float(llm_scores.get(sym, 0.0))
         quant_score = next((q for q, s in scored if s == sym), 0.0)
         merged.append((wq * quant_score + wl * llm_score, sym))
     merged.sort(reverse=True)
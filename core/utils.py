@@ -3,11 +3,16 @@ import math
 import os
 import time
 import pathlib
+import tempfile
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 BASE = pathlib.Path(__file__).resolve().parents[1]
 
+_MISSING = object()
+# path -> ((mtime_ns, size), parsed object)
+_JSON_CACHE: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
 
 def load_json(path: str, default: Any = None):
     """Enhanced JSON loading with better error handling"""
@@ -24,15 +29,63 @@ def load_json(path: str, default: Any = None):
         return default
 
 
+def load_json_cached(path: str, default: Any = None):
+    """load_json memoized on the file's (mtime_ns, size).
+
+    The returned object is shared between callers; treat it as read-only
+    and use load_json() when the data is going to be modified.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return default
+    sig = (st.st_mtime_ns, st.st_size)
+    hit = _JSON_CACHE.get(path)
+    if hit is not None and hit[0] == sig:
+        return hit[1]
+    data = load_json(path, _MISSING)
+    if data is _MISSING:
+        return default
+    _JSON_CACHE[path] = (sig, data)
+    return data
+
+
 def save_json(path: str, obj: Any):
     """Enhanced JSON saving with better error handling"""
+    _JSON_CACHE.pop(path, None)
+    tmp = None
     try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
+        folder = os.path.dirname(path) or "."
+        os.makedirs(folder, exist_ok=True)
+        # Write to a unique temp file, fsync, then swap in: readers never
+        # see a torn file and concurrent savers never share a temp file
+        fd, tmp = tempfile.mkstemp(
+            dir=folder, prefix=os.path.basename(path) + ".", suffix=".tmp"
+        )
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
             json.dump(obj, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, path)
+        tmp = None
     except Exception as e:
         print(f"Error saving {path}: {e}")
         raise
+    finally:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def update_json(path: str, **fields) -> Dict[str, Any]:
+    """Set several top-level keys with one read and one write"""
+    data = load_json(path, {})
+    data.update(fields)
+    save_json(path, data)
+    return data
 
 
 def load_config(mode: str) -> Dict[str, Any]: